@@ -0,0 +1,224 @@
+"""Stations of simulated devices set up like the integration does it."""
+
+from __future__ import annotations
+import asyncio
+from datetime import timedelta
+from decimal import Decimal
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, Dict, List
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers import entity as entity_helper
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import EntityPlatform
+from bluetti_bt_lib.bluetooth import device_reader
+from bluetti_bt_lib.devices import DEVICES
+from bluetti_bt_lib.fields import DecimalField, FieldName, UIntField
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "tests"))
+
+from custom_components.bluetti_bt import (  # noqa: E402
+    binary_sensor,
+    select,
+    sensor,
+    switch,
+)
+from custom_components.bluetti_bt.connection import ConnectionPool  # noqa: E402
+from custom_components.bluetti_bt.const import (  # noqa: E402
+    DATA_CONNECTION,
+    DATA_COORDINATOR,
+    DATA_DESCRIPTION,
+    DATA_LOCK,
+    DATA_WRITE_QUEUE,
+    DOMAIN,
+)
+from custom_components.bluetti_bt.coordinator import PollingCoordinator  # noqa: E402
+from custom_components.bluetti_bt.descriptions import (  # noqa: E402
+    get_device_description,
+)
+from custom_components.bluetti_bt.types import FullDeviceConfig  # noqa: E402
+from custom_components.bluetti_bt.write_queue import WriteQueue  # noqa: E402
+from simulator import SimulatedDevice, SimulatedTransport  # noqa: E402
+
+PLATFORMS: Dict[str, ModuleType] = {
+    "sensor": sensor,
+    "binary_sensor": binary_sensor,
+    "switch": switch,
+    "select": select,
+}
+
+
+class _ReaderAsyncio:
+    """asyncio for DeviceReader, without its wait after selecting a pack.
+
+    The reader gives a real device 3 seconds to fill the pack registers, the
+    simulator has them ready right away.
+    """
+
+    def __getattr__(self, name: str):
+        return getattr(asyncio, name)
+
+    @staticmethod
+    async def sleep(delay: float, result=None):
+        return await asyncio.sleep(0, result)
+
+
+async def async_start_hass(config_dir: str) -> HomeAssistant:
+    """Return a Home Assistant instance with the registries entities need."""
+    hass = HomeAssistant(config_dir)
+    entity_helper.async_setup(hass)
+    await er.async_load(hass)
+    await dr.async_load(hass)
+    # Affects all readers of this process, which only runs benchmarks
+    device_reader.asyncio = _ReaderAsyncio()
+    return hass
+
+
+class _EntityAdder:
+    """AddEntitiesCallback which adds to an entity platform."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        platform: EntityPlatform,
+        on_entity: Callable[[Entity], None],
+    ):
+        self.hass = hass
+        self.platform = platform
+        self.on_entity = on_entity
+        self.pending: List[Entity] = []
+        self.live = False
+
+    def __call__(self, entities, update_before_add: bool = False) -> None:
+        entities = list(entities)
+        for entity in entities:
+            self.on_entity(entity)
+
+        if not self.live:
+            self.pending.extend(entities)
+            return
+
+        self.hass.async_create_task(self.platform.async_add_entities(entities))
+
+
+class Station:
+    """A simulated device with its coordinator and entities."""
+
+    def __init__(self, hass: HomeAssistant, model: str, index: int, seed: int = 0):
+        self.hass = hass
+        self.model = model
+        self.random = random.Random(seed + index)
+        self.device = SimulatedDevice(
+            DEVICES[model](),
+            address=f"00:00:00:00:{index // 256:02X}:{index % 256:02X}",
+        )
+
+        data = {
+            "address": self.device.address,
+            "name": f"{model}{index:012d}",
+            "type": model,
+            "use_encryption": False,
+        }
+        self.config = FullDeviceConfig.from_dict(data)
+        self.entry = ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title=data["name"],
+            data=data,
+            source="user",
+            options={},
+        )
+
+        self.connection = ConnectionPool(
+            hass, self.device.address, transport=SimulatedTransport(self.device)
+        )
+        lock = asyncio.Lock()
+        self.coordinator = PollingCoordinator(hass, self.config, lock, self.connection)
+        self.entities: List[Entity] = []
+        self.writes = 0
+        self.setup_seconds: Dict[str, float] = {}
+        self.add_seconds: Dict[str, float] = {}
+
+        hass.data.setdefault(DOMAIN, {})[self.entry.entry_id] = {
+            DATA_COORDINATOR: self.coordinator,
+            DATA_DESCRIPTION: get_device_description(
+                model, self.coordinator.bluetti_device
+            ),
+            DATA_LOCK: lock,
+            DATA_CONNECTION: self.connection,
+            DATA_WRITE_QUEUE: WriteQueue(
+                hass,
+                self.coordinator,
+                self.coordinator.bluetti_device,
+                self.connection,
+                lock,
+            ),
+        }
+
+        # Attached battery packs get entities
+        for pack in range(1, self.device.device.max_packs // 2 + 1):
+            self.device.set_value(FieldName.PACK_VOLTAGE.value, Decimal("52.1"), pack)
+
+        self.vary()
+
+    async def async_setup(self) -> None:
+        """Set up all platforms, timing each of them."""
+        for domain, module in PLATFORMS.items():
+            platform = EntityPlatform(
+                hass=self.hass,
+                logger=logging.getLogger(f"{__name__}.{domain}"),
+                domain=domain,
+                platform_name=DOMAIN,
+                platform=None,
+                scan_interval=timedelta(seconds=30),
+                entity_namespace=None,
+            )
+            adder = _EntityAdder(self.hass, platform, self._track)
+
+            started = time.perf_counter()
+            await module.async_setup_entry(self.hass, self.entry, adder)
+            self.setup_seconds[domain] = time.perf_counter() - started
+
+            started = time.perf_counter()
+            await platform.async_add_entities(adder.pending)
+            self.add_seconds[domain] = time.perf_counter() - started
+
+            adder.live = True
+
+    def _track(self, entity: Entity) -> None:
+        """Count the state writes of an entity."""
+        self.entities.append(entity)
+        write = entity.async_write_ha_state
+
+        def counting_write() -> None:
+            self.writes += 1
+            write()
+
+        entity.async_write_ha_state = counting_write
+
+    def vary(self, share: float = 0.5) -> None:
+        """Change a share of the numeric values, like a device in use."""
+        for field in self.device.device.fields:
+            if self.random.random() > share:
+                continue
+
+            if isinstance(field, UIntField):
+                self.device.set_value(field.name, self.random.randint(0, 1000))
+            elif isinstance(field, DecimalField):
+                raw = Decimal(self.random.randint(0, 3000))
+                self.device.set_value(
+                    field.name,
+                    raw * Decimal(field.multiplier) / 10**field.scale,
+                )
+
+    async def async_close(self) -> None:
+        await self.coordinator.async_shutdown()
+        self.hass.data[DOMAIN].pop(self.entry.entry_id)
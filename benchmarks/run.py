@@ -0,0 +1,154 @@
+"""Run the benchmarks and print the results as JSON.
+
+    python -m benchmarks.run [--polls 20] [--models AC300 EB3A] [--output FILE]
+
+Every model of bluetti_bt_lib is set up against a simulated device and
+measured for:
+
+- poll: seconds per `_async_update_data`
+- fanout: seconds from a finished poll until all entities are written
+- writes_per_poll: `async_write_ha_state` calls per poll
+- memory: bytes allocated by one more station of the model
+- setup / add: seconds of each platform's `async_setup_entry` and of adding
+  its entities
+
+The output can be compared between releases to spot regressions.
+"""
+
+from __future__ import annotations
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List
+from homeassistant.const import __version__ as HA_VERSION
+from bluetti_bt_lib.devices import DEVICES
+
+from .harness import ROOT, Station, async_start_hass
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    return {
+        "mean": statistics.fmean(values),
+        "median": statistics.median(values),
+        "min": min(values),
+        "max": max(values),
+    }
+
+
+async def async_benchmark_model(model: str, polls: int) -> dict:
+    """Measure polls, entity fan-out and setup of a single station."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_start_hass(config_dir)
+        station = Station(hass, model, 1)
+
+        # The first poll also reads static fields, it isn't measured
+        station.coordinator.async_set_updated_data(
+            await station.coordinator._async_update_data()
+        )
+        await station.async_setup()
+        await hass.async_block_till_done()
+
+        poll_times = []
+        fanout_times = []
+        writes = []
+
+        for _ in range(polls):
+            station.vary()
+
+            started = time.perf_counter()
+            data = await station.coordinator._async_update_data()
+            poll_times.append(time.perf_counter() - started)
+
+            before = station.writes
+            started = time.perf_counter()
+            station.coordinator.async_set_updated_data(data)
+            fanout_times.append(time.perf_counter() - started)
+            writes.append(station.writes - before)
+
+            # Entities of newly attached packs
+            await hass.async_block_till_done()
+
+        result = {
+            "entities": len(station.entities),
+            "poll": _summary(poll_times),
+            "fanout": _summary(fanout_times),
+            "writes_per_poll": statistics.fmean(writes),
+            "setup": station.setup_seconds,
+            "add": station.add_seconds,
+            "memory": await _async_station_memory(hass, model),
+        }
+
+        await station.async_close()
+        await hass.async_stop(force=True)
+
+    return result
+
+
+async def _async_station_memory(hass, model: str) -> int:
+    """Return the bytes allocated by setting up one more station."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    station = Station(hass, model, 2)
+    station.coordinator.async_set_updated_data(
+        await station.coordinator._async_update_data()
+    )
+    await station.async_setup()
+    await hass.async_block_till_done()
+
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    await station.async_close()
+    return used
+
+
+async def async_run(models: List[str], polls: int) -> dict:
+    manifest = json.loads(
+        (ROOT / "custom_components" / "bluetti_bt" / "manifest.json").read_text()
+    )
+    results = {}
+
+    for model in models:
+        results[model] = await async_benchmark_model(model, polls)
+
+    return {
+        "version": manifest["version"],
+        "homeassistant": HA_VERSION,
+        "python": platform.python_version(),
+        "polls": polls,
+        "models": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--polls", type=int, default=20)
+    parser.add_argument("--models", nargs="+", default=sorted(DEVICES))
+    parser.add_argument("--output", help="write the results to this file")
+    args = parser.parse_args()
+
+    # Entities the platform rejects are logged, they don't stop a benchmark
+    logging.basicConfig(level=logging.CRITICAL)
+
+    results = asyncio.run(async_run(args.models, args.polls))
+    output = json.dumps(results, indent=2, sort_keys=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,22 +5,35 @@ import asyncio
 import re
 import logging
 from typing import List
-from homeassistant.components import bluetooth
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.typing import ConfigType
 from homeassistant.exceptions import ConfigEntryNotReady
 
 from .utils import mac_loggable
 from .const import (
+    DATA_CONNECTION,
     DATA_COORDINATOR,
+    DATA_DESCRIPTION,
+    DATA_FLEET,
     DATA_LOCK,
+    DATA_SNAPSHOT,
+    DATA_TRANSPORT,
+    DATA_WRITE_QUEUE,
     DOMAIN,
     MANUFACTURER,
 )
 from .types import FullDeviceConfig
+from .connection import ConnectionPool
 from .coordinator import PollingCoordinator
+from .descriptions import get_device_description
+from .fleet import Fleet
+from .profiler import async_setup_services
+from .snapshot import Snapshot, async_remove_snapshot
+from .write_queue import WriteQueue
 
 PLATFORMS: List[Platform] = [
     Platform.BINARY_SENSOR,
@@ -29,6 +42,14 @@ PLATFORMS: List[Platform] = [
     Platform.SELECT,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the services of the integration."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Bluetti Powerstation from a config entry."""
@@ -44,26 +65,78 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     logger.debug("Init Bluetti BT Integration")
 
-    if not bluetooth.async_address_present(hass, config.address):
-        raise ConfigEntryNotReady("Bluetti device not present")
-
     # Create data structure
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN].setdefault(entry.entry_id, {})
 
+    # Scheduler for the bluetooth connections of all devices
+    fleet = hass.data[DOMAIN].setdefault(DATA_FLEET, Fleet(hass))
+
     # Create lock
     lock = asyncio.Lock()
 
+    # Create connection shared by the coordinator and all controls, a
+    # transport stored in hass.data replaces bluetooth (e.g. a simulator)
+    connection = ConnectionPool(
+        hass,
+        config.address,
+        config.persistent_connection,
+        fleet,
+        hass.data[DOMAIN].get(DATA_TRANSPORT),
+    )
+
     # Create coordinator for polling
     logger.debug("Creating coordinator")
     coordinator = PollingCoordinator(
         hass,
         config,
         lock,
+        connection,
     )
-    await coordinator.async_config_entry_first_refresh()
+
+    # Restore the last known data, so entities don't wait for the first poll
+    snapshot = Snapshot(hass, entry.entry_id, coordinator.bluetti_device)
+    restored = await snapshot.async_load()
+
+    if restored is None:
+        if not connection.transport.is_present(config.address):
+            raise ConfigEntryNotReady("Bluetti device not present")
+
+        await coordinator.async_config_entry_first_refresh()
+    else:
+        logger.debug("Restored %s values, polling in background", len(restored))
+        coordinator.async_set_updated_data(restored)
+        entry.async_create_background_task(
+            hass,
+            coordinator.async_refresh(),
+            f"{DOMAIN} first refresh {mac_loggable(config.address)}",
+        )
+
+    entry.async_on_unload(
+        coordinator.async_add_listener(
+            lambda: snapshot.async_schedule_save(coordinator.data)
+        )
+    )
+
+    # Create queue for writes of all controls
+    write_queue = WriteQueue(
+        hass,
+        coordinator,
+        coordinator.bluetti_device,
+        connection,
+        lock,
+    )
+    entry.async_on_unload(write_queue.async_cancel)
+
+    # Field metadata used by all platforms, shared by devices of the same model
+    description = get_device_description(config.dev_type, coordinator.bluetti_device)
+
     hass.data[DOMAIN][entry.entry_id].setdefault(DATA_COORDINATOR, coordinator)
+    hass.data[DOMAIN][entry.entry_id].setdefault(DATA_DESCRIPTION, description)
     hass.data[DOMAIN][entry.entry_id].setdefault(DATA_LOCK, lock)
+    hass.data[DOMAIN][entry.entry_id].setdefault(DATA_CONNECTION, connection)
+    hass.data[DOMAIN][entry.entry_id].setdefault(DATA_WRITE_QUEUE, write_queue)
+    hass.data[DOMAIN][entry.entry_id].setdefault(DATA_SNAPSHOT, snapshot)
 
     logger.debug("Creating entities")
     # Setup platforms
@@ -74,6 +147,24 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Unload a config entry."""
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+
+    if unload_ok:
+        # Coordinator shutdown (and closing of its connection) is registered
+        # on the entry by DataUpdateCoordinator itself
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        await entry_data[DATA_SNAPSHOT].async_unload()
+
+    return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored data of a deleted config entry."""
+    await async_remove_snapshot(hass, entry.entry_id)
+
+
 def device_info(entry: ConfigEntry):
     """Device info."""
     config = FullDeviceConfig.from_dict(entry.data)
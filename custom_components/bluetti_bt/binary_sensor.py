@@ -4,19 +4,16 @@ from __future__ import annotations
 import logging
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-)
-from bluetti_bt_lib import build_device
 
 from .types import FullDeviceConfig
 from . import device_info as dev_info, get_unique_id
-from .const import DATA_COORDINATOR, DOMAIN
+from .const import DATA_COORDINATOR, DATA_DESCRIPTION, DOMAIN
 from .coordinator import PollingCoordinator
-from .utils import mac_loggable, unique_id_logable
+from .entity import BluettiEntity
+from .utils import mac_loggable
 
 
 async def async_setup_entry(
@@ -26,6 +23,7 @@ async def async_setup_entry(
 
     config = FullDeviceConfig.from_dict(entry.data)
     coordinator = hass.data[DOMAIN][entry.entry_id][DATA_COORDINATOR]
+    description = hass.data[DOMAIN][entry.entry_id][DATA_DESCRIPTION]
 
     logger = logging.getLogger(
         f"{__name__}.{mac_loggable(config.address).replace(':', '_')}"
@@ -39,13 +37,11 @@ async def async_setup_entry(
     device_info = dev_info(entry)
 
     # Add sensors
-    bluetti_device = build_device(config.name)
-
     sensors_to_add = []
-    bool_fields = bluetti_device.get_bool_fields()
+    bool_fields = description.bool_fields
 
     if config.use_encryption:
-        bool_fields = bool_fields + bluetti_device.get_switch_fields()
+        bool_fields = bool_fields + description.switch_fields
 
     for field in bool_fields:
         sensors_to_add.append(
@@ -61,9 +57,11 @@ async def async_setup_entry(
     async_add_entities(sensors_to_add)
 
 
-class BluettiBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class BluettiBinarySensor(BluettiEntity, BinarySensorEntity):
     """Bluetti universal binary sensor."""
 
+    __slots__ = ("_address",)
+
     def __init__(
         self,
         coordinator: PollingCoordinator,
@@ -73,83 +71,28 @@ class BluettiBinarySensor(CoordinatorEntity, BinarySensorEntity):
         logger: logging.Logger = logging.getLogger(),
     ):
         """Init binary entity."""
-        super().__init__(coordinator)
-        self.coordinator = coordinator
-        self._logger = logger
+        super().__init__(coordinator, response_key, logger)
 
         e_name = f"{device_info.get('name')} {response_key}"
         self._address = address
-        self._response_key = response_key
-        self._unavailable_counter = 5
 
-        self._attr_has_entity_name = True
         self._attr_device_info = device_info
         self._attr_translation_key = response_key
-        self._attr_available = False
         self._attr_unique_id = get_unique_id(e_name)
 
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return self._attr_available
-
-    def _set_available(self):
-        """Set sensor as available."""
-        self._attr_available = True
-        self._unavailable_counter = 0
-        self._attr_extra_state_attributes = {}
-        self.async_write_ha_state()
-
-    def _set_unavailable(self, cause: str = "Unknown"):
-        """Set sensor as unavailable."""
-        self._unavailable_counter += 1
+    def _current_value(self) -> bool | None:
+        return self._attr_is_on
 
-        self._attr_extra_state_attributes = {
-            "unavailable_counter": self._unavailable_counter,
-            "unavailable_cause": cause,
-        }
+    def _update_from_coordinator(self) -> None:
+        """Update availability, attributes and value from the coordinator data."""
+        response_data = self._coordinator_value()
 
-        if self._unavailable_counter >= 5:
-            self._attr_available = False
-
-        self.async_write_ha_state()
-
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-
-        if self.coordinator.data is None:
-            self._logger.debug(
-                "Data from coordinator is None",
-            )
-            self._set_unavailable("Data is None")
-            return
-
-        self._logger.debug(
-            "Updating state of %s", unique_id_logable(self._attr_unique_id)
-        )
-        if not isinstance(self.coordinator.data, dict):
-            self._logger.debug(
-                "Invalid data from coordinator (binary_sensor.%s)",
-                unique_id_logable(self._attr_unique_id),
-            )
-            self._set_unavailable("Invalid data")
-            return
-
-        response_data = self.coordinator.data.get(self._response_key)
         if response_data is None:
-            self._set_unavailable("No data")
             return
 
         if not isinstance(response_data, bool):
-            self._logger.warning(
-                "Invalid response data type from coordinator (binary_sensor.%s): %s",
-                unique_id_logable(self._attr_unique_id),
-                response_data,
-            )
-            self._set_unavailable("Invalid data type")
+            self._set_invalid_type(response_data)
             return
 
         self._set_available()
-        self._attr_is_on = self.coordinator.data[self._response_key] is True
-        self.async_write_ha_state()
+        self._attr_is_on = response_data
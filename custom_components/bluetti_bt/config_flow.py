@@ -14,7 +14,8 @@ from homeassistant.data_entry_flow import FlowResult
 from bluetti_bt_lib import recognize_device
 
 from .types import InitialDeviceConfig, ManufacturerData, OptionalDeviceConfig
-from .const import DOMAIN
+from .const import DATA_RECOGNITION_CACHE, DOMAIN
+from .recognition_cache import RecognitionCache
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,13 +35,21 @@ class BluettiConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         await self.async_set_unique_id(discovery_info.address)
         self._abort_if_unique_id_configured()
 
-        # Get device type
-        recognized = await recognize_device(
-            discovery_info.address, self.hass.loop.create_future
+        # Get device type, connecting only if it's not known yet
+        cache: RecognitionCache = self.hass.data.setdefault(DOMAIN, {}).setdefault(
+            DATA_RECOGNITION_CACHE, RecognitionCache(self.hass)
         )
+        recognized = await cache.async_get(discovery_info)
 
         if recognized is None:
-            return self.async_abort(reason="Device type not supported")
+            recognized = await recognize_device(
+                discovery_info.address, self.hass.loop.create_future
+            )
+
+            if recognized is None:
+                return self.async_abort(reason="Device type not supported")
+
+            await cache.async_set(discovery_info, recognized)
 
         _LOGGER.info(
             "Device identified as %s with iot module version %s (using encryption: %s)",
@@ -0,0 +1,234 @@
+"""Shared bluetooth connection for a Bluetti device."""
+
+from __future__ import annotations
+import asyncio
+from contextlib import asynccontextmanager
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable
+from bleak import BleakClient
+from bleak.exc import BleakError
+from homeassistant.core import HomeAssistant, callback
+
+from .fleet import Fleet
+from .transport import BluetoothTransport, Transport
+from .utils import mac_loggable
+
+
+class ConnectionPool:
+    """Bluetooth connection shared by the coordinator and all controls.
+
+    Readers and writers borrow the connection with `session()`. The pool
+    itself is handed to DeviceReader and DeviceWriter in place of a
+    BleakClient, so their disconnect after each operation is ignored and the
+    pool decides when the connection is closed.
+
+    While the pool is in use or its persistent connection is open it holds a
+    slot of the fleet, limiting the connections on the adapter shared with
+    other devices. An idle persistent connection is closed when another
+    device needs its slot.
+
+    Connections are opened by the `transport`, bluetooth by default.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        address: str,
+        persistent: bool = False,
+        fleet: Fleet | None = None,
+        transport: Transport | None = None,
+    ):
+        self.hass = hass
+        self.address = address
+        self.persistent = persistent
+        self.fleet = fleet
+        self.transport = transport or BluetoothTransport(hass)
+        self.logger = logging.getLogger(
+            f"{__name__}.{mac_loggable(address).replace(':', '_')}"
+        )
+
+        self.client: BleakClient | None = None
+        self._connect_lock = asyncio.Lock()
+        self._users = 0
+        self._slot_lock = asyncio.Lock()
+        self._slot_source: str | None = None
+        self._notifying = False
+        self._notify_callback: Callable[[Any, bytearray], Awaitable[None]] | None = None
+
+        self.connects = 0
+        self.last_connect_time: float | None = None
+        """Seconds the last successful connect took"""
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    @property
+    def is_connected(self) -> bool:
+        """Return if the connection is currently open."""
+        return self.client is not None and self.client.is_connected
+
+    def as_dict(self) -> dict:
+        return {
+            "connected": self.is_connected,
+            "persistent": self.persistent,
+            "users": self._users,
+            "connects": self.connects,
+            "last_connect_time": self.last_connect_time,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+        }
+
+    @asynccontextmanager
+    async def session(
+        self, stagger: bool = False, connect: bool = True
+    ) -> AsyncIterator[ConnectionPool | None]:
+        """Borrow the connection, yields None if the device can't be reached.
+
+        Polls should `stagger` their start with other devices. Readers which
+        connect on their own (encrypted devices) only take the fleet slot
+        and don't `connect` the pool.
+        """
+        self._users += 1
+        try:
+            await self._async_acquire_slot(stagger)
+
+            if not connect:
+                yield self
+            else:
+                yield self if await self.async_connect() else None
+        finally:
+            self._users -= 1
+            if self._users == 0:
+                if not (self.persistent and self.is_connected and self._park_slot()):
+                    await self.async_close()
+
+    async def _async_acquire_slot(self, stagger: bool) -> None:
+        """Take a fleet slot, shared by all sessions running at the same time."""
+        if self.fleet is None:
+            return
+
+        async with self._slot_lock:
+            if self._slot_source is None:
+                self._slot_source = await self.fleet.async_acquire(
+                    self.address, stagger
+                )
+            else:
+                self.fleet.unpark(self._slot_source, self._evict)
+
+    def _park_slot(self) -> bool:
+        """Keep the slot for the open connection, False if it's needed elsewhere."""
+        if self.fleet is None or self._slot_source is None:
+            return True
+        return self.fleet.park(self._slot_source, self._evict)
+
+    def _release_slot(self) -> None:
+        if self.fleet is not None and self._slot_source is not None:
+            self.fleet.unpark(self._slot_source, self._evict)
+            self.fleet.release(self._slot_source)
+            self._slot_source = None
+
+    @callback
+    def _evict(self) -> None:
+        """Close the idle connection, another device needs the slot."""
+        self.hass.async_create_task(self._async_evict())
+
+    async def _async_evict(self) -> None:
+        # A session started meanwhile gives the slot back when it ends
+        if self._users == 0:
+            self.logger.debug("Closing idle connection for another device")
+            await self.async_close()
+
+    async def async_connect(self) -> bool:
+        """Connect if there is no open connection."""
+        async with self._connect_lock:
+            if self.is_connected:
+                return True
+
+            self.logger.debug("Connecting to device")
+            started = self.hass.loop.time()
+            self.client = await self.transport.async_connect(
+                self.address, self._on_disconnect
+            )
+
+            if self.client is None:
+                return False
+
+            self.connects += 1
+            self.last_connect_time = self.hass.loop.time() - started
+            self._notifying = False
+            return True
+
+    async def async_close(self) -> None:
+        """Close the connection, the slot is given back unless a session runs."""
+        client = self.client
+        self.client = None
+        self._notifying = False
+
+        if self._users == 0:
+            self._release_slot()
+
+        if client is not None:
+            await client.disconnect()
+            self.logger.debug("Disconnected from device")
+
+    @callback
+    def _on_disconnect(self, client: BleakClient) -> None:
+        """Drop the client so the next session reconnects."""
+        if client is not self.client:
+            return
+
+        self.logger.debug("Connection lost")
+        self.client = None
+        self._notifying = False
+
+        if self._users == 0:
+            self._release_slot()
+
+    async def _notification_handler(self, char: Any, data: bytearray) -> None:
+        """Forward notifications to the current reader."""
+        self.bytes_received += len(data)
+
+        if self._notify_callback is not None:
+            await self._notify_callback(char, data)
+
+    # The methods below are used by DeviceReader and DeviceWriter, which
+    # expect a BleakClient
+
+    async def connect(self) -> None:
+        """Connect the pool."""
+        await self.async_connect()
+
+    async def disconnect(self) -> None:
+        """Ignored, the pool closes the connection when the session ends."""
+        return
+
+    async def start_notify(
+        self,
+        char_specifier: Any,
+        callback: Callable[[Any, bytearray], Awaitable[None]],
+        **kwargs,
+    ) -> None:
+        """Route notifications to the callback, subscribing only once."""
+        if self.client is None:
+            raise BleakError("Not connected")
+
+        self._notify_callback = callback
+
+        if not self._notifying:
+            await self.client.start_notify(
+                char_specifier, self._notification_handler, **kwargs
+            )
+            self._notifying = True
+
+    async def stop_notify(self, char_specifier: Any) -> None:
+        """Detach the callback but keep the subscription."""
+        self._notify_callback = None
+
+    async def write_gatt_char(
+        self, char_specifier: Any, data: Any, response: bool | None = None
+    ) -> None:
+        """Write to the device."""
+        if self.client is None:
+            raise BleakError("Not connected")
+
+        self.bytes_sent += len(data)
+        await self.client.write_gatt_char(char_specifier, data, response)
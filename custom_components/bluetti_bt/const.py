@@ -7,3 +7,61 @@ CONF_OPTIONS = "options"
 
 DATA_COORDINATOR = "coordinator"
 DATA_LOCK = "lock"
+DATA_CONNECTION = "connection"
+DATA_DESCRIPTION = "description"
+DATA_WRITE_QUEUE = "write_queue"
+DATA_FLEET = "fleet"
+DATA_RECOGNITION_CACHE = "recognition_cache"
+DATA_TRANSPORT = "transport"
+DATA_PROFILER = "profiler"
+DATA_SNAPSHOT = "snapshot"
+
+# Seconds without traffic after which a persistent connection is kept alive
+KEEPALIVE_INTERVAL = 10
+
+# Seconds to wait before the first read-back of a written value, doubled on
+# every further attempt until the value is confirmed or the timeout is hit.
+# Devices may reset registers which are read before a write is applied, 5
+# seconds is the wait the integration always used and known to be safe.
+WRITE_VERIFY_INITIAL_DELAY = 5
+WRITE_VERIFY_TIMEOUT = 16
+
+# Seconds to collect writes before they are sent as one batch
+WRITE_QUEUE_WINDOW = 0.3
+
+# Connections one bluetooth adapter or proxy handles at the same time
+MAX_CONNECTIONS_PER_ADAPTER = 2
+# Minimum seconds between the poll starts of devices on the same adapter
+POLL_START_SPACING = 2
+
+# Seconds a recognized device type is reused by the config flow
+RECOGNITION_CACHE_TTL = 7 * 24 * 60 * 60
+
+# Seconds between polls of slow changing fields and battery packs
+SLOW_POLL_INTERVAL = 60
+
+# Change in watts between two polls which makes adaptive polling speed up
+ADAPTIVE_POWER_THRESHOLD = 20
+# Growth of the adaptive polling interval per poll without power changes
+ADAPTIVE_BACKOFF_FACTOR = 1.25
+
+# Seconds before the first retry of a failed poll, doubled on every further
+# failure up to the maximum
+RETRY_BASE_DELAY = 2
+RETRY_MAX_DELAY = 60
+# Seconds to pause polling after max_retries failed polls in a row
+RETRY_BREAKER_TIMEOUT = 300
+
+# Seconds to collect data changes before the snapshot is saved
+SNAPSHOT_SAVE_DELAY = 60
+
+# Seconds a battery pack has to report no voltage before it is removed
+PACK_RETIRE_TIMEOUT = 600
+
+# Seconds after which a sensor change within its deadband is written anyway
+DEADBAND_HEARTBEAT = 15 * 60
+
+# Polls kept for the link quality statistics
+LINK_STATS_WINDOW = 100
+# Upper bounds in seconds of the buckets of the poll time histogram
+LINK_HISTOGRAM_BUCKETS = (0.5, 1, 2, 5, 10, 30)
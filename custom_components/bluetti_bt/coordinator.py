@@ -4,15 +4,63 @@ from __future__ import annotations
 import asyncio
 from datetime import timedelta
 import logging
-from homeassistant.components import bluetooth
-from homeassistant.core import HomeAssistant
+from typing import Any, Callable, Dict, List, Tuple
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-from bluetti_bt_lib import build_device, DeviceReader, DeviceReaderConfig
+from bluetti_bt_lib import (
+    build_device,
+    BluettiDevice,
+    DeviceField,
+    DeviceReader,
+    DeviceReaderConfig,
+)
+from bluetti_bt_lib.registers import ReadableRegisters
 
+from .connection import ConnectionPool
+from .const import (
+    KEEPALIVE_INTERVAL,
+    WRITE_VERIFY_INITIAL_DELAY,
+    WRITE_VERIFY_TIMEOUT,
+)
+from .device_view import DeviceView
+from .link_stats import LinkStats
+from .retry import RetryEngine
+from .scheduler import AdaptiveInterval, PollPlan, PollScheduler
 from .utils import mac_loggable
 from .types import FullDeviceConfig
 
 
+class PollRecord:
+    """Diagnostics of a single poll."""
+
+    def __init__(
+        self,
+        tiers: List[str],
+        success: bool,
+        read_time: float | None,
+        changed_keys: List[str],
+        field_count: int,
+    ):
+        self.tiers = tiers
+        self.success = success
+        self.read_time = read_time
+        """Seconds spent reading from the connected device, without waiting for
+        a connection. None if it was absent or couldn't be connected"""
+        self.changed_keys = changed_keys
+        """Data keys which were added or changed by this poll"""
+        self.field_count = field_count
+
+    def as_dict(self) -> dict:
+        return {
+            "tiers": self.tiers,
+            "success": self.success,
+            "read_time": self.read_time,
+            "changed_keys": self.changed_keys,
+            "field_count": self.field_count,
+        }
+
+
 class PollingCoordinator(DataUpdateCoordinator):
     """Polling coordinator."""
 
@@ -21,6 +69,7 @@ class PollingCoordinator(DataUpdateCoordinator):
         hass: HomeAssistant,
         config: FullDeviceConfig,
         lock: asyncio.Lock,
+        connection: ConnectionPool,
     ):
         """Initialize coordinator."""
         super().__init__(
@@ -33,6 +82,14 @@ class PollingCoordinator(DataUpdateCoordinator):
         )
 
         self.config = config
+        self.connection = connection
+        self.lock = lock
+        self._notified_data: dict | None = None
+        self._unsub_keepalive: CALLBACK_TYPE | None = None
+        self.last_poll: PollRecord | None = None
+        self._poll_listeners: Dict[CALLBACK_TYPE, Callable[[PollRecord], None]] = {}
+        self.retry = RetryEngine(config.max_retries)
+        self.link_stats = LinkStats()
 
         # Create client
         self.logger.info("Creating client for %s", config.name)
@@ -43,15 +100,37 @@ class PollingCoordinator(DataUpdateCoordinator):
             self.async_shutdown()
             return None
 
-        self.reader = DeviceReader(
-            config.address,
-            bluetti_device,
+        self.bluetti_device = bluetti_device
+
+        self.scheduler = PollScheduler(bluetti_device)
+        self.adaptive: AdaptiveInterval | None = None
+
+        if config.adaptive_polling:
+            self.adaptive = AdaptiveInterval(
+                bluetti_device,
+                config.polling_interval_min,
+                config.polling_interval_max,
+                config.polling_interval,
+            )
+
+        self._keepalive_reader = self._build_reader(
+            DeviceView(bluetti_device, bluetti_device.get_device_type_registers())
+        )
+
+    def _build_reader(self, device: BluettiDevice | DeviceView) -> DeviceReader:
+        """Create a reader for the device or a part of it."""
+        return DeviceReader(
+            self.config.address,
+            device,
             self.hass.loop.create_future,
             DeviceReaderConfig(
-                config.polling_timeout,
-                config.use_encryption,
+                self.config.polling_timeout,
+                self.config.use_encryption,
             ),
-            lock,
+            self.lock,
+            # The encryption handshake is done on every connect, so the reader
+            # has to own the connection of encrypted devices
+            None if self.config.use_encryption else self.connection,
         )
 
     async def _async_update_data(self):
@@ -61,15 +140,293 @@ class PollingCoordinator(DataUpdateCoordinator):
         so entities can quickly look up their data.
         """
 
-        # Check if device is connected
-        if (
-            bluetooth.async_address_present(
-                self.hass, self.config.address, connectable=True
-            )
-            is False
-        ):
+        started = self.hass.loop.time()
+
+        # Check if device is connected, this costs nothing and is done even
+        # while the breaker keeps the device from being read
+        if not self.connection.transport.is_present(self.config.address):
             self.logger.warning("Device not connected")
             self.last_update_success = False
+            self._retry_later(started, absent=True)
+            self._record_poll(None, None, None)
+            self.scheduler.reset()
             return None
 
-        return await self.reader.read()
+        self.retry.present()
+
+        if not self.retry.allow(started):
+            self.logger.debug("Too many failed polls, waiting before next attempt")
+            self.scheduler.reset()
+            return None
+
+        plan = self.scheduler.plan(started)
+        data, read_time = await self._async_read(self._build_reader(plan.view))
+        self.scheduler.complete(plan, data is not None)
+
+        if data is None:
+            self._retry_later(started)
+            self._record_poll(plan, None, read_time)
+            return None
+
+        self.retry.success()
+        self._record_poll(plan, data, read_time)
+
+        # Keep the last values of fields which were not due in this poll
+        if isinstance(self.data, dict):
+            data = {
+                **{k: v for k, v in self.data.items() if k not in plan.keys},
+                **data,
+            }
+
+        if self.adaptive is not None:
+            self.update_interval = timedelta(
+                seconds=self.adaptive.update(self.data, data)
+            )
+        else:
+            self.update_interval = timedelta(seconds=self.config.polling_interval)
+
+        return data
+
+    def _retry_later(self, now: float, absent: bool = False) -> None:
+        """Schedule the next poll after a failure.
+
+        Absent devices are looked for at the polling interval, so they are
+        read again soon after they are back.
+        """
+        delay = self.retry.failure(now, absent)
+        if absent:
+            delay = min(delay, self.config.polling_interval)
+        self.logger.debug(
+            "Poll failed %s times in a row (%s), next attempt in %.1fs",
+            self.retry.failures,
+            self.retry.state.value,
+            delay,
+        )
+        self.update_interval = timedelta(seconds=delay)
+
+    @callback
+    def _record_poll(
+        self, plan: PollPlan | None, data: dict | None, read_time: float | None
+    ) -> None:
+        """Log the poll once and pass its record to the poll listeners.
+
+        Without a plan, the device was absent and not read at all.
+        """
+        previous = self.data if isinstance(self.data, dict) else {}
+        changed_keys = [
+            key
+            for key, value in (data or {}).items()
+            if key not in previous or previous[key] != value
+        ]
+
+        record = PollRecord(
+            [] if plan is None else [tier.name for tier in plan.tiers],
+            data is not None,
+            read_time,
+            changed_keys,
+            len(data or {}),
+        )
+        self.last_poll = record
+        self.link_stats.add(record.success, record.read_time)
+
+        if plan is not None:
+            self.logger.debug(
+                "Poll of %s %s after reading %ss, %s of %s fields changed: %s",
+                record.tiers,
+                "succeeded" if record.success else "failed",
+                None if read_time is None else round(read_time, 2),
+                len(record.changed_keys),
+                record.field_count,
+                record.changed_keys,
+            )
+
+        for poll_listener in list(self._poll_listeners.values()):
+            poll_listener(record)
+
+    @callback
+    def async_add_poll_listener(
+        self, poll_listener: Callable[[PollRecord], None]
+    ) -> CALLBACK_TYPE:
+        """Call the listener with the record of every poll.
+
+        Also called for polls of an absent device, after the retry state was
+        updated.
+        """
+
+        @callback
+        def remove_poll_listener() -> None:
+            self._poll_listeners.pop(remove_poll_listener)
+
+        # Kept by their remove callback like the coordinator's listeners, the
+        # callback stays valid if the listener is replaced
+        self._poll_listeners[remove_poll_listener] = poll_listener
+        return remove_poll_listener
+
+    async def _async_read(
+        self, reader: DeviceReader
+    ) -> Tuple[dict | None, float | None]:
+        """Read using the shared connection if possible.
+
+        Returns the data and the seconds spent reading, which start once the
+        connection slot is acquired. Encrypted readers connect by themselves,
+        their time includes connecting.
+        """
+        if self.config.use_encryption:
+            async with self.connection.session(stagger=True, connect=False):
+                started = self.hass.loop.time()
+                data = await reader.read()
+                return data, self.hass.loop.time() - started
+
+        self._cancel_keepalive()
+
+        async with self.connection.session(stagger=True) as client:
+            if client is None:
+                return None, None
+
+            started = self.hass.loop.time()
+            data = await reader.read()
+            read_time = self.hass.loop.time() - started
+
+        self._schedule_keepalive()
+        return data, read_time
+
+    async def async_shutdown(self) -> None:
+        """Cancel keepalive and close the connection."""
+        await super().async_shutdown()
+        self._cancel_keepalive()
+        await self.connection.async_close()
+
+    @callback
+    def _schedule_keepalive(self) -> None:
+        """Keep the connection alive if polls are further apart than the link allows."""
+        if (
+            not self.connection.persistent
+            or self.update_interval.total_seconds() <= KEEPALIVE_INTERVAL
+        ):
+            return
+
+        # Only one keepalive is pending, a poll and a keepalive both finishing
+        # would otherwise leave a timer which is never cancelled
+        self._cancel_keepalive()
+        self._unsub_keepalive = async_call_later(
+            self.hass, KEEPALIVE_INTERVAL, self._async_keepalive
+        )
+
+    @callback
+    def _cancel_keepalive(self) -> None:
+        if self._unsub_keepalive is not None:
+            self._unsub_keepalive()
+            self._unsub_keepalive = None
+
+    async def _async_keepalive(self, _now) -> None:
+        """Read a small register block to keep the connection alive.
+
+        The handle of the fired timer is kept while reading. A poll starting
+        meanwhile cancels it, and the poll schedules the next keepalive.
+        """
+        handle = self._unsub_keepalive
+
+        if not self.connection.is_connected:
+            self._unsub_keepalive = None
+            return
+
+        if self.lock.locked():
+            # Another read or write is keeping the link busy
+            self._schedule_keepalive()
+            return
+
+        self.logger.debug("Sending keepalive")
+        async with self.connection.session() as client:
+            if client is not None:
+                await self._keepalive_reader.read()
+
+        if self._unsub_keepalive is handle:
+            self._schedule_keepalive()
+
+    async def async_verify_writes(self, writes: List[Tuple[DeviceField, Any]]) -> bool:
+        """Re-read written fields until the device reports the new values.
+
+        Confirmed values are published to all listeners without a full
+        refresh. If the device doesn't confirm all of them in time, a refresh
+        is requested instead. Polls skip the fields until verification ends.
+        """
+        expected = {field.name: value for field, value in writes}
+        reader = self._build_reader(
+            DeviceView(
+                self.bluetti_device,
+                [ReadableRegisters(field.address, field.size) for field, _ in writes],
+            )
+        )
+        loop = self.hass.loop
+        deadline = loop.time() + WRITE_VERIFY_TIMEOUT
+        delay = WRITE_VERIFY_INITIAL_DELAY
+        confirmed: dict[str, Any] = {}
+
+        # Reading the registers too early might reset them (see
+        # WRITE_VERIFY_INITIAL_DELAY), polls leave them alone meanwhile
+        self.scheduler.hold(expected)
+        try:
+            async with self.connection.session() as client:
+                while client is not None and loop.time() + delay < deadline:
+                    # Give the device time to apply the values
+                    await asyncio.sleep(delay)
+                    delay *= 2
+
+                    data = await reader.read() or {}
+
+                    for name, value in expected.items():
+                        if data.get(name) == value:
+                            confirmed[name] = value
+
+                    if len(confirmed) == len(expected):
+                        break
+        finally:
+            self.scheduler.release(expected)
+
+        if confirmed:
+            self.logger.debug("Writes confirmed: %s", list(confirmed))
+            self.async_set_field_values(confirmed)
+
+        if len(confirmed) == len(expected):
+            return True
+
+        self.logger.warning(
+            "Writes not confirmed by device: %s",
+            [name for name in expected if name not in confirmed],
+        )
+        await self.async_request_refresh()
+        return False
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify only the listeners of keys which changed.
+
+        Entities register with their data key as context. When the data
+        becomes available or unavailable as a whole, all listeners are
+        notified. Listeners of missing keys are always notified, so entities
+        can count failed updates.
+        """
+        data = self.data if isinstance(self.data, dict) else None
+        previous = self._notified_data
+        self._notified_data = data
+
+        if data is None or previous is None:
+            super().async_update_listeners()
+            return
+
+        for update_callback, context in list(self._listeners.values()):
+            if (
+                context is None
+                or context not in data
+                or data[context] != previous.get(context)
+            ):
+                update_callback()
+
+    @callback
+    def async_set_field_values(self, values: dict[str, Any]) -> None:
+        """Merge confirmed values into the data and notify listeners."""
+        if not isinstance(self.data, dict):
+            return
+
+        self.data = {**self.data, **values}
+        self.async_update_listeners()
@@ -0,0 +1,163 @@
+"""Entity descriptions of Bluetti device fields."""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, List, Tuple
+from homeassistant.const import EntityCategory
+from bluetti_bt_lib import BluettiDevice, DeviceField, FieldName, get_unit
+from bluetti_bt_lib.fields import (
+    BoolField,
+    DecimalArrayField,
+    DecimalField,
+    EnumField,
+    SerialNumberField,
+    StringField,
+    SwapStringField,
+    UIntField,
+    VersionField,
+)
+
+from .types import (
+    Deadband,
+    get_category,
+    get_deadband,
+    get_device_class,
+    get_state_class,
+)
+
+
+@dataclass(frozen=True)
+class FieldDescription:
+    """Everything needed to create the entity of a field."""
+
+    field: DeviceField
+    field_name: FieldName
+    unit: str | None
+    device_class: str | None
+    state_class: str | None
+    category: EntityCategory | None
+    converter: Callable[[Any], Any]
+    """Turns a parsed value into the entity state"""
+    deadband: Deadband | None
+
+    @property
+    def name(self) -> str:
+        return self.field.name
+
+    @property
+    def address(self) -> int:
+        return self.field.address
+
+
+@dataclass(frozen=True)
+class DeviceDescription:
+    """Field descriptions of a device model, grouped by entity platform."""
+
+    sensor_fields: Tuple[FieldDescription, ...]
+    bool_fields: Tuple[FieldDescription, ...]
+    switch_fields: Tuple[FieldDescription, ...]
+    select_fields: Tuple[FieldDescription, ...]
+    pack_fields: Tuple[FieldDescription, ...]
+
+
+_DESCRIPTIONS: Dict[str, DeviceDescription] = {}
+
+
+def get_device_description(model: str, device: BluettiDevice) -> DeviceDescription:
+    """Return the descriptions of a model, they are only built once."""
+    description = _DESCRIPTIONS.get(model)
+
+    if description is None:
+        description = DeviceDescription(
+            _describe(device.get_sensor_fields()),
+            _describe(device.get_bool_fields()),
+            _describe(device.get_switch_fields()),
+            _describe(device.get_select_fields()),
+            _describe(device.pack_fields),
+        )
+        _DESCRIPTIONS[model] = description
+
+    return description
+
+
+def _describe(fields) -> Tuple[FieldDescription, ...]:
+    descriptions = []
+
+    for field in fields:
+        field_name = FieldName(field.name)
+        device_class = get_device_class(field_name)
+        descriptions.append(
+            FieldDescription(
+                field,
+                field_name,
+                get_unit(field_name),
+                device_class,
+                get_state_class(field_name),
+                get_category(field_name),
+                get_converter(field),
+                get_deadband(field_name, device_class),
+            )
+        )
+
+    return tuple(descriptions)
+
+
+def get_converter(field: DeviceField) -> Callable[[Any], Any]:
+    """Return the conversion of the values of a field, based on its type.
+
+    Converters raise AttributeError or TypeError on values of the wrong type.
+    """
+    if isinstance(field, EnumField):
+        return enum_name
+    if isinstance(field, BoolField):
+        return bool_value
+    if isinstance(field, (UIntField, SerialNumberField)):
+        return number_value
+    if isinstance(field, (DecimalField, VersionField)):
+        return decimal_value
+    if isinstance(field, DecimalArrayField):
+        return decimal_list
+    if isinstance(field, (StringField, SwapStringField)):
+        return string_value
+    return same_value
+
+
+def enum_name(value: Enum) -> str:
+    return value.name
+
+
+def bool_value(value: bool) -> bool:
+    if not isinstance(value, bool):
+        raise TypeError(f"Expected bool, got {type(value).__name__}")
+    return value
+
+
+def number_value(value: int | float | Decimal) -> int | float | Decimal:
+    # bool is an int, but never a valid number
+    if isinstance(value, bool) or not isinstance(value, (int, float, Decimal)):
+        raise TypeError(f"Expected a number, got {type(value).__name__}")
+    return value
+
+
+def decimal_value(value: Decimal) -> Decimal:
+    if not isinstance(value, Decimal):
+        raise TypeError(f"Expected Decimal, got {type(value).__name__}")
+    return value
+
+
+def decimal_list(value: List[Decimal]) -> List[Decimal]:
+    if not isinstance(value, list) or not all(isinstance(v, Decimal) for v in value):
+        raise TypeError(f"Expected a list of Decimal, got {value!r}")
+    return value
+
+
+def string_value(value: str) -> str:
+    if not isinstance(value, str):
+        raise TypeError(f"Expected str, got {type(value).__name__}")
+    return value
+
+
+def same_value(value: Any) -> Any:
+    return value
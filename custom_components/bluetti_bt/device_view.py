@@ -0,0 +1,50 @@
+"""Partial view of a Bluetti device."""
+
+from __future__ import annotations
+from typing import List
+from bluetti_bt_lib import BluettiDevice
+from bluetti_bt_lib.registers import ReadableRegisters, WriteableRegister
+
+
+class DeviceView:
+    """Expose a subset of the registers and battery packs of a device.
+
+    DeviceReader reads every polling register and sweeps all battery packs of
+    the device it is given, even when only some registers are requested.
+    Handing it a view limits a read to what is actually needed.
+    """
+
+    def __init__(
+        self,
+        device: BluettiDevice,
+        registers: List[ReadableRegisters],
+        packs: List[int] | None = None,
+        pack_registers: List[ReadableRegisters] | None = None,
+    ):
+        self.device = device
+        self.registers = registers
+        self.packs = packs or []
+        self.max_packs = len(self.packs)
+        self.pack_registers = (
+            device.get_pack_polling_registers()
+            if pack_registers is None
+            else pack_registers
+        )
+
+    def get_polling_registers(self) -> List[ReadableRegisters]:
+        return self.registers
+
+    def get_pack_polling_registers(self) -> List[ReadableRegisters]:
+        if not self.packs:
+            return []
+        return self.pack_registers
+
+    def get_pack_selector(self, pack: int) -> WriteableRegister:
+        return self.device.get_pack_selector(self.packs[pack - 1])
+
+    def parse(
+        self, starting_address: int, data: bytes, pack_num: int | None = None
+    ) -> dict:
+        if pack_num is not None:
+            pack_num = self.packs[pack_num - 1]
+        return self.device.parse(starting_address, data, pack_num)
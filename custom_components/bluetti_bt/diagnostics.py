@@ -0,0 +1,43 @@
+"""Diagnostics support for Bluetti BT."""
+
+from __future__ import annotations
+from typing import Any
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_CONNECTION, DATA_COORDINATOR, DATA_FLEET, DOMAIN
+from .coordinator import PollingCoordinator
+
+# The name of a device contains its serial number
+TO_REDACT = {"address", "name", "title"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return the link quality and polling state of a device."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    coordinator: PollingCoordinator = entry_data[DATA_COORDINATOR]
+    fleet = hass.data[DOMAIN].get(DATA_FLEET)
+
+    return {
+        "entry": async_redact_data(
+            {"title": entry.title, "data": dict(entry.data)}, TO_REDACT
+        ),
+        "coordinator": {
+            "update_interval": coordinator.update_interval.total_seconds(),
+            "last_update_success": coordinator.last_update_success,
+            "field_count": len(coordinator.data or {}),
+            "last_poll": (
+                coordinator.last_poll.as_dict() if coordinator.last_poll else None
+            ),
+        },
+        "link": {
+            **coordinator.link_stats.as_dict(),
+            "rssi": coordinator.connection.transport.rssi(coordinator.config.address),
+        },
+        "retry": coordinator.retry.as_dict(),
+        "connection": entry_data[DATA_CONNECTION].as_dict(),
+        "fleet": fleet.as_dict() if fleet is not None else None,
+    }
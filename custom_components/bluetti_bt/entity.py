@@ -0,0 +1,138 @@
+"""Base entity for Bluetti devices."""
+
+from __future__ import annotations
+from abc import ABC, abstractmethod
+import logging
+from types import MappingProxyType
+from typing import Any, Mapping
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .coordinator import PollingCoordinator
+from .utils import unique_id_logable
+
+# Shared by all available entities instead of a new dict per update
+NO_ATTRIBUTES: Mapping[str, Any] = MappingProxyType({})
+
+
+class BluettiEntity(CoordinatorEntity[PollingCoordinator], ABC):
+    """Availability handling shared by all Bluetti entities.
+
+    Updates without usable data are counted, the entity becomes unavailable
+    after `max_retries` of them in a row. The state is only written when
+    availability, attributes or the value changed. The entity platforms
+    implement how the value is read from the coordinator data.
+    """
+
+    __slots__ = ("_logger", "_response_key", "_unavailable_counter")
+
+    def __init__(
+        self,
+        coordinator: PollingCoordinator,
+        response_key: str,
+        logger: logging.Logger,
+    ):
+        super().__init__(coordinator, context=response_key)
+        self._logger = logger
+        self._response_key = response_key
+        self._unavailable_counter = 0
+
+        self._attr_has_entity_name = True
+        self._attr_available = False
+        self._attr_extra_state_attributes = NO_ATTRIBUTES
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to updates and show the current data."""
+        await super().async_added_to_hass()
+
+        # Listeners are only called for changed values, so render the data
+        # which was read before this entity was added
+        if self.coordinator.data is not None:
+            self._handle_coordinator_update()
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return self._attr_available
+
+    def _set_available(self) -> None:
+        self._attr_available = True
+        self._unavailable_counter = 0
+        self._attr_extra_state_attributes = NO_ATTRIBUTES
+
+    def _set_unavailable(self, cause: str = "Unknown") -> None:
+        self._unavailable_counter += 1
+
+        self._attr_extra_state_attributes = {
+            "unavailable_counter": self._unavailable_counter,
+            "unavailable_cause": cause,
+        }
+
+        if self._unavailable_counter >= self.coordinator.config.max_retries:
+            self._attr_available = False
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        previous = self._current_state()
+        self._update_from_coordinator()
+        current = self._current_state()
+
+        # Only write if something changed
+        if current != previous and self._should_write(previous, current):
+            self.async_write_ha_state()
+
+    def _should_write(self, previous: tuple, current: tuple) -> bool:
+        """Return if a changed state is written, may revert the change."""
+        return True
+
+    def _current_state(self) -> tuple:
+        """Return everything that ends up in the state machine."""
+        return (
+            self._attr_available,
+            self._attr_extra_state_attributes,
+            self._current_value(),
+        )
+
+    @abstractmethod
+    def _current_value(self) -> Any:
+        """Return the value shown as the entity state."""
+
+    @abstractmethod
+    def _update_from_coordinator(self) -> None:
+        """Update availability, attributes and value from the coordinator data."""
+
+    def _coordinator_value(self) -> Any | None:
+        """Return the value of this entity, None counts as a failed update."""
+        data = self.coordinator.data
+
+        if data is None:
+            self._logger.debug("Data from coordinator is None")
+            self._set_unavailable("Data is None")
+            return None
+
+        if not isinstance(data, dict):
+            self._logger.warning(
+                "Invalid data from coordinator (%s)",
+                unique_id_logable(self._attr_unique_id),
+            )
+            self._set_unavailable("Invalid data")
+            return None
+
+        value = data.get(self._response_key)
+
+        if value is None:
+            self._logger.debug("No data available for %s", self._response_key)
+            self._set_unavailable("No data")
+            return None
+
+        return value
+
+    def _set_invalid_type(self, value: Any) -> None:
+        self._logger.warning(
+            "Invalid response data type from coordinator (%s): %s has type %s",
+            unique_id_logable(self._attr_unique_id),
+            value,
+            type(value),
+        )
+        self._set_unavailable("Invalid data type")
@@ -0,0 +1,117 @@
+"""Bluetooth airtime shared by all Bluetti devices."""
+
+from __future__ import annotations
+import asyncio
+import logging
+from typing import Callable, Dict, List
+from homeassistant.components import bluetooth
+from homeassistant.core import HomeAssistant
+
+from .const import MAX_CONNECTIONS_PER_ADAPTER, POLL_START_SPACING
+
+
+class Fleet:
+    """Schedule the connections of all configured devices.
+
+    Each adapter or bluetooth proxy only handles a few connections at once.
+    Devices get a slot on the adapter which last saw them before connecting,
+    waiting devices are served in order of arrival. Polls on the same
+    adapter are started at least POLL_START_SPACING seconds apart, so devices
+    set up together don't keep colliding.
+
+    Idle persistent connections keep their slot, they are parked and evicted
+    as soon as another device waits for a slot on their adapter.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_connections: int = MAX_CONNECTIONS_PER_ADAPTER,
+        spacing: float = POLL_START_SPACING,
+    ):
+        self.hass = hass
+        self.max_connections = max_connections
+        self.spacing = spacing
+        self.logger = logging.getLogger(__name__)
+
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._in_use: Dict[str, int] = {}
+        self._parked: Dict[str, List[Callable[[], None]]] = {}
+        self._waiting: Dict[str, int] = {}
+        self._next_start: Dict[str, float] = {}
+
+    def source(self, address: str) -> str:
+        """Return the adapter or proxy a device is reached through."""
+        service_info = bluetooth.async_last_service_info(
+            self.hass, address, connectable=True
+        )
+
+        if service_info is None:
+            return "unknown"
+
+        return service_info.source
+
+    async def async_acquire(self, address: str, stagger: bool = False) -> str:
+        """Wait for a slot on the adapter of the device, returns the adapter."""
+        source = self.source(address)
+
+        if stagger:
+            await self._async_stagger(source)
+
+        slot = self._slots.setdefault(source, asyncio.Semaphore(self.max_connections))
+
+        if slot.locked():
+            self.logger.debug("Waiting for a free connection on %s", source)
+
+            parked = self._parked.get(source)
+            if parked:
+                # The longest parked connection gives up its slot
+                parked.pop(0)()
+
+        self._waiting[source] = self._waiting.get(source, 0) + 1
+        try:
+            await slot.acquire()
+        finally:
+            self._waiting[source] -= 1
+
+        self._in_use[source] = self._in_use.get(source, 0) + 1
+        return source
+
+    def release(self, source: str) -> None:
+        """Give back a slot."""
+        self._slots[source].release()
+        self._in_use[source] -= 1
+
+    def park(self, source: str, evict: Callable[[], None]) -> bool:
+        """Keep a slot for an idle connection, `evict` gives it back when needed.
+
+        Returns False if another device is waiting, the slot has to be given
+        back right away.
+        """
+        if self._waiting.get(source):
+            return False
+
+        self._parked.setdefault(source, []).append(evict)
+        return True
+
+    def unpark(self, source: str, evict: Callable[[], None]) -> None:
+        """The connection is used again or closed, it can't be evicted."""
+        parked = self._parked.get(source, [])
+        if evict in parked:
+            parked.remove(evict)
+
+    def as_dict(self) -> dict:
+        return {
+            "max_connections": self.max_connections,
+            "connections": dict(self._in_use),
+            "parked": {source: len(p) for source, p in self._parked.items() if p},
+        }
+
+    async def _async_stagger(self, source: str) -> None:
+        """Reserve the next poll start time of the adapter and wait for it."""
+        now = self.hass.loop.time()
+        start = max(now, self._next_start.get(source, now))
+        self._next_start[source] = start + self.spacing
+
+        if start > now:
+            await asyncio.sleep(start - now)
@@ -0,0 +1,64 @@
+"""Link quality of a Bluetti device."""
+
+from __future__ import annotations
+from collections import deque
+from typing import Deque, Dict, Tuple
+
+from .const import LINK_HISTOGRAM_BUCKETS, LINK_STATS_WINDOW
+
+
+class LinkStats:
+    """Rolling statistics of the last LINK_STATS_WINDOW polls."""
+
+    def __init__(self):
+        self.polls = 0
+        self.failed_polls = 0
+        self._window: Deque[Tuple[bool, float | None]] = deque(maxlen=LINK_STATS_WINDOW)
+
+    def add(self, success: bool, poll_time: float | None = None) -> None:
+        """Record a poll, the poll time is None if the device was not read."""
+        self.polls += 1
+        if not success:
+            self.failed_polls += 1
+        self._window.append((success, poll_time))
+
+    @property
+    def success_ratio(self) -> float | None:
+        """Share of successful polls in the window."""
+        if not self._window:
+            return None
+        return sum(success for success, _ in self._window) / len(self._window)
+
+    def percentile(self, share: float) -> float | None:
+        """Return the poll time below which `share` of the successful polls are."""
+        times = sorted(t for success, t in self._window if success and t is not None)
+        if not times:
+            return None
+        return times[min(len(times) - 1, int(share * len(times)))]
+
+    def histogram(self) -> Dict[str, int]:
+        """Count the poll times in the window by bucket."""
+        buckets = {f"{bound}s": 0 for bound in LINK_HISTOGRAM_BUCKETS}
+        buckets["slower"] = 0
+
+        for _, poll_time in self._window:
+            if poll_time is None:
+                continue
+            bucket = next(
+                (f"{b}s" for b in LINK_HISTOGRAM_BUCKETS if poll_time <= b),
+                "slower",
+            )
+            buckets[bucket] += 1
+
+        return buckets
+
+    def as_dict(self) -> dict:
+        return {
+            "polls": self.polls,
+            "failed_polls": self.failed_polls,
+            "window": len(self._window),
+            "success_ratio": self.success_ratio,
+            "median": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "histogram": self.histogram(),
+        }
@@ -0,0 +1,119 @@
+"""Battery packs attached to a Bluetti device."""
+
+from __future__ import annotations
+import logging
+from typing import Callable, Dict, List, Set
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.entity import DeviceInfo, Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from bluetti_bt_lib import FieldName
+
+from .const import DOMAIN, MANUFACTURER, PACK_RETIRE_TIMEOUT
+from .coordinator import PollingCoordinator
+
+
+class PackTracker:
+    """Add and remove battery pack entities as packs are attached and detached.
+
+    Entities of a pack are created once the coordinator reads a voltage for
+    it. A pack which reports no voltage for PACK_RETIRE_TIMEOUT seconds is
+    removed from the device registry, together with its entities.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: PollingCoordinator,
+        device_info: DeviceInfo,
+        create_entities: Callable[[int, DeviceInfo], List[Entity]],
+        async_add_entities: AddEntitiesCallback,
+        logger: logging.Logger = logging.getLogger(),
+    ):
+        self.hass = hass
+        self.coordinator = coordinator
+        self.address = coordinator.config.address
+        self.main_name = device_info.get("name")
+        self.max_packs = coordinator.bluetti_device.max_packs
+        self._create_entities = create_entities
+        self._async_add_entities = async_add_entities
+        self._logger = logger
+
+        self._packs: Set[int] = set()
+        self._retired: Set[int] = set()
+        self._detached_since: Dict[int, float] = {}
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Add the packs seen so far and follow coordinator updates."""
+        self.async_update()
+        return self.coordinator.async_add_listener(self.async_update)
+
+    @callback
+    def async_update(self) -> None:
+        """Compare the attached packs with the current data."""
+        data = self.coordinator.data
+
+        if not isinstance(data, dict):
+            return
+
+        now = self.hass.loop.time()
+        entities_to_add: List[Entity] = []
+
+        for num in range(1, self.max_packs + 1):
+            attached = _is_attached(data, num)
+
+            if attached is None:
+                # Pack was not read yet
+                continue
+
+            if attached:
+                self._detached_since.pop(num, None)
+                self._retired.discard(num)
+
+                if num not in self._packs:
+                    self._logger.info("Battery pack %s attached", num)
+                    self._packs.add(num)
+                    entities_to_add += self._create_entities(
+                        num, self.pack_device_info(num)
+                    )
+                continue
+
+            detached_since = self._detached_since.setdefault(num, now)
+
+            if num not in self._retired and now - detached_since >= PACK_RETIRE_TIMEOUT:
+                self._retire(num)
+
+        if entities_to_add:
+            self._async_add_entities(entities_to_add)
+
+    def pack_device_info(self, num: int) -> DeviceInfo:
+        return DeviceInfo(
+            identifiers={(DOMAIN, f"{self.address}_pack_{num}")},
+            name=f"{self.main_name} Battery Pack {num}",
+            manufacturer=MANUFACTURER,
+        )
+
+    def _retire(self, num: int) -> None:
+        """Remove the device of a pack, the registry removes its entities."""
+        self._packs.discard(num)
+        self._retired.add(num)
+
+        device_registry = dr.async_get(self.hass)
+        device = device_registry.async_get_device(
+            identifiers={(DOMAIN, f"{self.address}_pack_{num}")}
+        )
+
+        if device is not None:
+            self._logger.info("Battery pack %s detached, removing it", num)
+            device_registry.async_remove_device(device.id)
+
+
+def _is_attached(data: dict, num: int) -> bool | None:
+    """Return if a pack is attached, None if it's unknown."""
+    voltage = data.get(f"pack_{num}_{FieldName.PACK_VOLTAGE.value}")
+
+    if voltage is None:
+        return None
+
+    return voltage > 0
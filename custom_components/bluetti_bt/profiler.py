@@ -0,0 +1,301 @@
+"""Opt-in profiling of the hot paths of the integration."""
+
+from __future__ import annotations
+from functools import wraps
+import inspect
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+
+from .const import DATA_COORDINATOR, DATA_PROFILER, DOMAIN
+from .coordinator import PollingCoordinator
+
+SERVICE_START = "start_profiling"
+SERVICE_STOP = "stop_profiling"
+SERVICE_DUMP = "dump_profile"
+
+
+class _Timing:
+    """Cumulative times of a profiled method for one device."""
+
+    __slots__ = ("calls", "wall", "loop", "cpu")
+
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0
+        """Seconds from call to return, including waits"""
+        self.loop = 0.0
+        """Seconds the method blocked the event loop"""
+        self.cpu = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "wall": round(self.wall, 6),
+            "loop": round(self.loop, 6),
+            "cpu": round(self.cpu, 6),
+        }
+
+
+class _TimedCoroutine:
+    """Run a coroutine, timing each step it runs on the event loop."""
+
+    def __init__(self, coro, timing: _Timing):
+        self._coro = coro
+        self._timing = timing
+
+    def __await__(self):
+        timing = self._timing
+        started = time.perf_counter()
+        value: Any = None
+        error: BaseException | None = None
+
+        try:
+            while True:
+                step_started = time.perf_counter()
+                step_cpu = time.thread_time()
+                try:
+                    if error is None:
+                        future = self._coro.send(value)
+                    else:
+                        future = self._coro.throw(error)
+                except StopIteration as stop:
+                    return stop.value
+                finally:
+                    timing.loop += time.perf_counter() - step_started
+                    timing.cpu += time.thread_time() - step_cpu
+
+                value, error = None, None
+                try:
+                    value = yield future
+                except BaseException as err:  # pylint: disable=broad-except
+                    error = err
+        finally:
+            timing.calls += 1
+            timing.wall += time.perf_counter() - started
+
+
+class Profiler:
+    """Wall time, event loop time, CPU time and calls per method and device.
+
+    While enabled, the profiled methods of the coordinator and the entity
+    classes are replaced by timing wrappers. Disabled, the original methods
+    are restored, so profiling costs nothing unless it is used.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.started: float | None = None
+        self.stopped: float | None = None
+        self._timings: Dict[Tuple[str, str], _Timing] = {}
+        self._originals: List[Tuple[type, str, Any]] = []
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._originals)
+
+    def start(self, coordinators: Iterable[PollingCoordinator] = ()) -> None:
+        """Start profiling, previous results are dropped.
+
+        The listeners of entities already added to the coordinators are bound
+        to the timing wrappers.
+        """
+        coordinators = list(coordinators)
+        if self.enabled:
+            self.stop(coordinators)
+
+        self._timings = {}
+        self.started = time.perf_counter()
+        self.stopped = None
+
+        for name, cls, method, device_of in _targets():
+            original = cls.__dict__.get(method)
+            self._originals.append((cls, method, original))
+            setattr(cls, method, self._wrap(name, getattr(cls, method), device_of))
+
+        for coordinator in coordinators:
+            _rebind_listeners(coordinator)
+
+        self.logger.info("Profiling started")
+
+    def stop(self, coordinators: Iterable[PollingCoordinator] = ()) -> None:
+        """Restore the original methods, results are kept."""
+        if not self.enabled:
+            return
+
+        for cls, method, original in reversed(self._originals):
+            if original is None:
+                delattr(cls, method)
+            else:
+                setattr(cls, method, original)
+
+        self._originals = []
+        for coordinator in coordinators:
+            _rebind_listeners(coordinator)
+
+        self.stopped = time.perf_counter()
+        self.logger.info("Profiling stopped")
+
+    def report(self) -> dict:
+        """Return the timings by method and device."""
+        elapsed = None
+        if self.started is not None:
+            elapsed = (self.stopped or time.perf_counter()) - self.started
+
+        methods: Dict[str, Dict[str, dict]] = {}
+        devices: Dict[str, _Timing] = {}
+
+        for (name, device), timing in sorted(self._timings.items()):
+            methods.setdefault(name, {})[device] = timing.as_dict()
+
+            total = devices.setdefault(device, _Timing())
+            total.calls += timing.calls
+            total.loop += timing.loop
+            total.cpu += timing.cpu
+
+        return {
+            "enabled": self.enabled,
+            "elapsed": None if elapsed is None else round(elapsed, 3),
+            "methods": methods,
+            "devices": {
+                device: {
+                    "calls": total.calls,
+                    "loop": round(total.loop, 6),
+                    "cpu": round(total.cpu, 6),
+                    # Share of the event loop's time taken by the device
+                    "loop_share": round(total.loop / elapsed, 6) if elapsed else None,
+                }
+                for device, total in devices.items()
+            },
+        }
+
+    def _timing(self, name: str, device: str) -> _Timing:
+        timing = self._timings.get((name, device))
+        if timing is None:
+            timing = self._timings[(name, device)] = _Timing()
+        return timing
+
+    def _wrap(
+        self, name: str, method: Callable, device_of: Callable[[Any], str]
+    ) -> Callable:
+        if inspect.iscoroutinefunction(method):
+
+            @wraps(method)
+            async def timed_async(instance, *args, **kwargs):
+                timing = self._timing(name, device_of(instance))
+                return await _TimedCoroutine(method(instance, *args, **kwargs), timing)
+
+            return timed_async
+
+        @wraps(method)
+        def timed(instance, *args, **kwargs):
+            timing = self._timing(name, device_of(instance))
+            started = time.perf_counter()
+            cpu = time.thread_time()
+            try:
+                return method(instance, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                timing.calls += 1
+                timing.wall += elapsed
+                timing.loop += elapsed
+                timing.cpu += time.thread_time() - cpu
+
+        return timed
+
+
+def _rebind_listeners(coordinator: PollingCoordinator) -> None:
+    """Look up the listeners of a coordinator again on their instance.
+
+    Entities register bound methods, which keep calling the function they
+    were bound to after the method on the class is replaced or restored.
+    """
+
+    def rebind(listener: Callable) -> Callable:
+        instance = getattr(listener, "__self__", None)
+        if instance is None:
+            return listener
+        return getattr(instance, listener.__name__)
+
+    # pylint: disable=protected-access
+    for remove, (update_callback, context) in list(coordinator._listeners.items()):
+        coordinator._listeners[remove] = (rebind(update_callback), context)
+
+    for remove, poll_listener in list(coordinator._poll_listeners.items()):
+        coordinator._poll_listeners[remove] = rebind(poll_listener)
+
+
+def _targets() -> List[Tuple[str, type, str, Callable[[Any], str]]]:
+    """Return the profiled methods: name, class, method and the device of an instance."""
+    # Imported here, the platforms import the integration itself
+    from .binary_sensor import BluettiBinarySensor
+    from .select import BluettiSelect
+    from .sensor import BluettiLinkSensor, BluettiSensor
+    from .switch import BluettiSwitch
+
+    def coordinator_device(coordinator) -> str:
+        return coordinator.config.name
+
+    def entity_device(entity) -> str:
+        return entity.coordinator.config.name
+
+    return [
+        (
+            "coordinator._async_update_data",
+            PollingCoordinator,
+            "_async_update_data",
+            coordinator_device,
+        ),
+        *(
+            (
+                f"{platform}._handle_coordinator_update",
+                cls,
+                "_handle_coordinator_update",
+                entity_device,
+            )
+            for platform, cls in (
+                ("sensor", BluettiSensor),
+                ("binary_sensor", BluettiBinarySensor),
+                ("switch", BluettiSwitch),
+                ("select", BluettiSelect),
+            )
+        ),
+        ("sensor._handle_poll", BluettiLinkSensor, "_handle_poll", entity_device),
+        ("switch.write_to_device", BluettiSwitch, "write_to_device", entity_device),
+        ("select.write_to_device", BluettiSelect, "write_to_device", entity_device),
+    ]
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services which control profiling."""
+    profiler = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_PROFILER, Profiler())
+
+    def coordinators() -> List[PollingCoordinator]:
+        return [
+            entry_data[DATA_COORDINATOR]
+            for entry_data in hass.data[DOMAIN].values()
+            if isinstance(entry_data, dict) and DATA_COORDINATOR in entry_data
+        ]
+
+    async def async_start(call: ServiceCall) -> None:
+        profiler.start(coordinators())
+
+    async def async_stop(call: ServiceCall) -> None:
+        profiler.stop(coordinators())
+
+    async def async_dump(call: ServiceCall) -> ServiceResponse:
+        report = profiler.report()
+        profiler.logger.info("Profile: %s", report)
+        return report
+
+    hass.services.async_register(DOMAIN, SERVICE_START, async_start)
+    hass.services.async_register(DOMAIN, SERVICE_STOP, async_stop)
+    hass.services.async_register(
+        DOMAIN, SERVICE_DUMP, async_dump, supports_response=SupportsResponse.OPTIONAL
+    )
@@ -0,0 +1,85 @@
+"""Recognized devices, kept across restarts."""
+
+from __future__ import annotations
+import logging
+from typing import Any, Dict
+from homeassistant.components.bluetooth import BluetoothServiceInfoBleak
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from bluetti_bt_lib import DeviceRecognizerResult
+
+from .const import DOMAIN, RECOGNITION_CACHE_TTL
+
+STORAGE_VERSION = 1
+
+
+class RecognitionCache:
+    """Results of `recognize_device` by address.
+
+    Recognizing a device needs a connection, which is slow and blocks the
+    adapter. A result is reused for RECOGNITION_CACHE_TTL seconds as long as
+    the device advertises the same name and manufacturer data, a firmware
+    update changing the advertisement invalidates it.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self.logger = logging.getLogger(__name__)
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.recognition")
+        self._entries: Dict[str, Dict[str, Any]] | None = None
+
+    async def async_get(
+        self, discovery_info: BluetoothServiceInfoBleak
+    ) -> DeviceRecognizerResult | None:
+        """Return the cached result for a discovered device."""
+        entries = await self._async_entries()
+        entry = entries.get(discovery_info.address)
+
+        if entry is None:
+            return None
+
+        if (
+            entry["fingerprint"] != fingerprint(discovery_info)
+            or dt_util.utcnow().timestamp() - entry["time"] > RECOGNITION_CACHE_TTL
+        ):
+            self.logger.debug("Cached recognition expired")
+            entries.pop(discovery_info.address)
+            await self._store.async_save(entries)
+            return None
+
+        return DeviceRecognizerResult(
+            entry["name"],
+            entry["iot_version"],
+            entry["encrypted"],
+            entry["sn"],
+        )
+
+    async def async_set(
+        self,
+        discovery_info: BluetoothServiceInfoBleak,
+        recognized: DeviceRecognizerResult,
+    ) -> None:
+        entries = await self._async_entries()
+        entries[discovery_info.address] = {
+            "name": recognized.name,
+            "iot_version": recognized.iot_version,
+            "encrypted": recognized.encrypted,
+            "sn": recognized.sn,
+            "fingerprint": fingerprint(discovery_info),
+            "time": dt_util.utcnow().timestamp(),
+        }
+        await self._store.async_save(entries)
+
+    async def _async_entries(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            self._entries = await self._store.async_load() or {}
+        return self._entries
+
+
+def fingerprint(discovery_info: BluetoothServiceInfoBleak) -> str:
+    """Return what the device advertises about itself."""
+    manufacturer_data = ",".join(
+        f"{key}:{value.hex()}"
+        for key, value in sorted(discovery_info.manufacturer_data.items())
+    )
+    return f"{discovery_info.name}|{manufacturer_data}"
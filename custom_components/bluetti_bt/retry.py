@@ -0,0 +1,87 @@
+"""Retries of failed polls."""
+
+from __future__ import annotations
+from enum import Enum
+import random
+
+from .const import RETRY_BASE_DELAY, RETRY_BREAKER_TIMEOUT, RETRY_MAX_DELAY
+
+
+class RetryState(Enum):
+    OK = "ok"
+    RETRYING = "retrying"
+    OPEN = "open"
+    """Too many failures, polls are paused"""
+    HALF_OPEN = "half_open"
+    """Pause is over, the next poll decides if polling resumes"""
+
+
+class RetryEngine:
+    """Decide when a failed poll is retried.
+
+    Failed polls are retried after an exponentially growing, jittered delay.
+    After `max_retries` failures in a row the circuit opens and the device
+    is left alone for RETRY_BREAKER_TIMEOUT seconds, then a single poll is
+    allowed to find out if it's back. A device which was absent gets that
+    poll as soon as it is seen again.
+    """
+
+    def __init__(self, max_retries: int):
+        self.max_retries = max_retries
+        self.state = RetryState.OK
+        self.failures = 0
+        self.last_delay: float | None = None
+        self._opened_at: float | None = None
+        self._absent = False
+
+    def allow(self, now: float) -> bool:
+        """Return if the device may be polled."""
+        if self.state != RetryState.OPEN:
+            return True
+
+        if now - self._opened_at < RETRY_BREAKER_TIMEOUT:
+            return False
+
+        self.state = RetryState.HALF_OPEN
+        return True
+
+    def present(self) -> None:
+        """The device is seen, after being absent it may be polled right away."""
+        if self.state == RetryState.OPEN and self._absent:
+            self.state = RetryState.HALF_OPEN
+        self._absent = False
+
+    def success(self) -> None:
+        self.state = RetryState.OK
+        self.failures = 0
+        self.last_delay = None
+        self._opened_at = None
+
+    def failure(self, now: float, absent: bool = False) -> float:
+        """Record a failed poll, returns the seconds until the next attempt.
+
+        An `absent` device was not seen at all, it wasn't tried to connect.
+        """
+        self.failures += 1
+        self._absent = absent
+
+        if self.state == RetryState.HALF_OPEN or self.failures >= self.max_retries:
+            self.state = RetryState.OPEN
+            self._opened_at = now
+            self.last_delay = RETRY_BREAKER_TIMEOUT
+            return self.last_delay
+
+        self.state = RetryState.RETRYING
+
+        # Equal jitter: half of the delay is fixed, the other half random
+        delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (self.failures - 1))
+        self.last_delay = delay / 2 + random.uniform(0, delay / 2)
+        return self.last_delay
+
+    def as_dict(self) -> dict:
+        return {
+            "state": self.state.value,
+            "failures": self.failures,
+            "max_retries": self.max_retries,
+            "last_delay": self.last_delay,
+        }
@@ -0,0 +1,215 @@
+"""Poll scheduling for Bluetti devices."""
+
+from __future__ import annotations
+from typing import Dict, Iterable, List, Set, Tuple
+from homeassistant.components.sensor import SensorDeviceClass
+from bluetti_bt_lib import BluettiDevice, FieldName
+from bluetti_bt_lib.registers import ReadableRegisters
+
+from .const import (
+    ADAPTIVE_BACKOFF_FACTOR,
+    ADAPTIVE_POWER_THRESHOLD,
+    SLOW_POLL_INTERVAL,
+)
+from .device_view import DeviceView
+from .types import FIELD_DEVICE_CLASS, PollTier, get_poll_tier
+
+
+class PollPlan:
+    """Registers and battery packs read in a single poll."""
+
+    def __init__(self, view: DeviceView, tiers: List[PollTier], keys: Set[str]):
+        self.view = view
+        self.tiers = tiers
+        self.keys = keys
+        """Data keys of all fields read by this plan"""
+
+
+class PollScheduler:
+    """Decide which registers are due in a poll.
+
+    Fast fields are read on every poll, slow fields every SLOW_POLL_INTERVAL
+    seconds and static fields like serial numbers and firmware versions only
+    once, or again after a failed poll.
+
+    Battery packs are read round robin, at most one per poll: each pack is
+    due SLOW_POLL_INTERVAL seconds after it was last read and the least
+    recently read one goes first. A poll takes about as long with four
+    packs attached as with one.
+
+    Fields with a write waiting to be verified are held back, polls leave
+    their registers alone until the write is confirmed.
+    """
+
+    def __init__(self, device: BluettiDevice):
+        self.device = device
+
+        self._registers: Dict[PollTier, List[Tuple[str, ReadableRegisters]]] = {
+            tier: [] for tier in PollTier
+        }
+        self._pack_registers: Dict[PollTier, List[ReadableRegisters]] = {
+            tier: [] for tier in PollTier
+        }
+        self._keys: Dict[PollTier, Set[str]] = {tier: set() for tier in PollTier}
+        self._pack_keys: Dict[PollTier, Set[str]] = {tier: set() for tier in PollTier}
+
+        for field in device.fields:
+            tier = get_poll_tier(FieldName(field.name))
+            self._registers[tier].append(
+                (field.name, ReadableRegisters(field.address, field.size))
+            )
+            self._keys[tier].add(field.name)
+
+        if device.max_packs > 0:
+            for field in device.pack_fields:
+                tier = get_poll_tier(FieldName(field.name))
+                self._pack_registers[tier].append(
+                    ReadableRegisters(field.address, field.size)
+                )
+                self._pack_keys[tier].add(field.name)
+
+        self._pack_read: Dict[int, float | None] = {}
+        if any(self._pack_registers.values()):
+            self._pack_read = {p: None for p in range(1, device.max_packs + 1)}
+
+        self._last_slow: float | None = None
+        self._static_done = False
+        self._held: Dict[str, int] = {}
+
+    def plan(self, now: float) -> PollPlan:
+        """Return the plan for a poll started at `now` (monotonic seconds)."""
+        tiers = [PollTier.FAST]
+
+        if self._last_slow is None or now - self._last_slow >= SLOW_POLL_INTERVAL:
+            tiers.append(PollTier.SLOW)
+            self._last_slow = now
+
+        if not self._static_done:
+            tiers.append(PollTier.STATIC)
+
+        registers = [
+            r
+            for tier in tiers
+            for key, r in self._registers[tier]
+            if key not in self._held
+        ]
+        keys = {k for tier in tiers for k in self._keys[tier] if k not in self._held}
+        pack = self._due_pack(now)
+        packs = []
+        pack_registers = []
+
+        if pack is not None:
+            pack_tiers = [PollTier.FAST, PollTier.SLOW]
+            if self._pack_read[pack] is None:
+                pack_tiers.append(PollTier.STATIC)
+
+            packs = [pack]
+            pack_registers = [
+                r for tier in pack_tiers for r in self._pack_registers[tier]
+            ]
+            keys.update(
+                f"pack_{pack}_{k}" for tier in pack_tiers for k in self._pack_keys[tier]
+            )
+            self._pack_read[pack] = now
+
+        if packs and not registers:
+            # DeviceReader needs at least one register before reading packs
+            registers = self.device.get_polling_registers()[:1]
+
+        return PollPlan(
+            DeviceView(self.device, registers, packs, pack_registers),
+            tiers,
+            keys,
+        )
+
+    def hold(self, keys: Iterable[str]) -> None:
+        """Leave fields out of polls until they are released."""
+        for key in keys:
+            self._held[key] = self._held.get(key, 0) + 1
+
+    def release(self, keys: Iterable[str]) -> None:
+        """Poll held fields again, once every hold of them is released."""
+        for key in keys:
+            if self._held.get(key, 0) <= 1:
+                self._held.pop(key, None)
+            else:
+                self._held[key] -= 1
+
+    def complete(self, plan: PollPlan, success: bool) -> None:
+        """Record the result of a poll."""
+        if not success:
+            self.reset()
+            return
+
+        if PollTier.STATIC in plan.tiers:
+            self._static_done = True
+
+    def reset(self) -> None:
+        """Read everything again once the device is back.
+
+        The data of the coordinator is gone after a failed or skipped poll,
+        so fields of all tiers have to be read to fill it again.
+        """
+        self._last_slow = None
+        self._static_done = False
+        self._pack_read = {p: None for p in self._pack_read}
+
+    def _due_pack(self, now: float) -> int | None:
+        due = [
+            p
+            for p, read in self._pack_read.items()
+            if read is None or now - read >= SLOW_POLL_INTERVAL
+        ]
+
+        if not due:
+            return None
+
+        # Never read packs first, then the least recently read one
+        return min(
+            due, key=lambda p: (self._pack_read[p] is not None, self._pack_read[p] or 0)
+        )
+
+
+class AdaptiveInterval:
+    """Adapt the polling interval to how fast power values change.
+
+    The interval is halved when a power field changed by more than
+    ADAPTIVE_POWER_THRESHOLD watts since the last poll and slowly grows back
+    while the values stay put, bounded by the configured minimum and maximum.
+    """
+
+    def __init__(self, device: BluettiDevice, minimum: int, maximum: int, start: int):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.interval: float = start
+
+        self._power_keys = [
+            f.name
+            for f in device.fields
+            if FIELD_DEVICE_CLASS.get(FieldName(f.name)) == SensorDeviceClass.POWER
+        ]
+
+    def update(self, previous: dict | None, current: dict) -> float:
+        """Return the interval to use after a poll returned `current`."""
+        if self._changing(previous, current):
+            self.interval = max(self.minimum, self.interval / 2)
+        else:
+            self.interval = min(self.maximum, self.interval * ADAPTIVE_BACKOFF_FACTOR)
+
+        return self.interval
+
+    def _changing(self, previous: dict | None, current: dict) -> bool:
+        if not isinstance(previous, dict):
+            return False
+
+        for key in self._power_keys:
+            old = previous.get(key)
+            new = current.get(key)
+
+            if old is None or new is None:
+                continue
+
+            if abs(new - old) > ADAPTIVE_POWER_THRESHOLD:
+                return True
+
+        return False
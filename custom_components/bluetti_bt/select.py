@@ -1,29 +1,24 @@
 """Bluetti BT switches."""
 
 from __future__ import annotations
-import asyncio
 import logging
-import async_timeout
-from bleak import BleakScanner
-from bleak_retry_connector import BleakClientWithServiceCache, establish_connection
 from homeassistant.components.select import SelectEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant
 from homeassistant.const import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-)
 
-from bluetti_bt_lib import build_device, BluettiDevice, DeviceWriter, FieldName
+from bluetti_bt_lib import BluettiDevice
 from bluetti_bt_lib.fields import SelectField
 
-from .types import FullDeviceConfig, get_category
+from .types import FullDeviceConfig
 from . import device_info as dev_info, get_unique_id
-from .const import DATA_COORDINATOR, DATA_LOCK, DOMAIN
+from .const import DATA_COORDINATOR, DATA_DESCRIPTION, DATA_WRITE_QUEUE, DOMAIN
 from .coordinator import PollingCoordinator
-from .utils import mac_loggable, unique_id_logable
+from .entity import BluettiEntity
+from .write_queue import WriteQueue
+from .utils import mac_loggable
 
 
 async def async_setup_entry(
@@ -33,7 +28,8 @@ async def async_setup_entry(
 
     config = FullDeviceConfig.from_dict(entry.data)
     coordinator = hass.data[DOMAIN][entry.entry_id][DATA_COORDINATOR]
-    lock = hass.data[DOMAIN][entry.entry_id][DATA_LOCK]
+    write_queue = hass.data[DOMAIN][entry.entry_id][DATA_WRITE_QUEUE]
+    description = hass.data[DOMAIN][entry.entry_id][DATA_DESCRIPTION]
 
     logger = logging.getLogger(
         f"{__name__}.{mac_loggable(config.address).replace(':', '_')}"
@@ -52,22 +48,17 @@ async def async_setup_entry(
     device_info = dev_info(entry)
 
     # Add switches
-    bluetti_device = build_device(config.name)
-
     switches_to_add = []
-    switch_fields = bluetti_device.get_select_fields()
-    for field in switch_fields:
-        category = get_category(FieldName(field.name))
-
+    for field_description in description.select_fields:
         switches_to_add.append(
             BluettiSelect(
-                bluetti_device,
+                coordinator.bluetti_device,
                 config.address,
                 coordinator,
                 device_info,
-                field,
-                lock,
-                category=category,
+                field_description.field,
+                write_queue,
+                category=field_description.category,
                 logger=logger,
             )
         )
@@ -75,9 +66,11 @@ async def async_setup_entry(
     async_add_entities(switches_to_add)
 
 
-class BluettiSelect(CoordinatorEntity, SelectEntity):
+class BluettiSelect(BluettiEntity, SelectEntity):
     """Bluetti universal switch."""
 
+    __slots__ = ("_bluetti_device", "_address", "_field", "_write_queue")
+
     def __init__(
         self,
         bluetti_device: BluettiDevice,
@@ -85,96 +78,42 @@ class BluettiSelect(CoordinatorEntity, SelectEntity):
         coordinator: PollingCoordinator,
         device_info: DeviceInfo,
         field: SelectField,
-        lock: asyncio.Lock,
+        write_queue: WriteQueue,
         category: EntityCategory | None = None,
         logger: logging.Logger = logging.getLogger(),
     ):
         """Init entity."""
-        super().__init__(coordinator)
-        self.coordinator = coordinator
-        self._logger = logger
+        super().__init__(coordinator, field.name, logger)
 
         e_name = f"{device_info.get('name')} {field.name}"
         self._bluetti_device = bluetti_device
         self._address = address
         self._field = field
-        self._response_key = field.name
-        self._unavailable_counter = 5
-        self._lock = lock
+        self._write_queue = write_queue
         self._attr_options = [e.name for e in field.e]
+        self._attr_current_option = None
 
-        self._attr_has_entity_name = True
         self._attr_device_info = device_info
         self._attr_translation_key = field.name
-        self._attr_available = False
         self._attr_unique_id = get_unique_id(e_name)
         self._attr_entity_category = category
 
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return self._attr_available
-
-    def _set_available(self):
-        """Set switch as available."""
-        self._attr_available = True
-        self._unavailable_counter = 0
-        self._attr_extra_state_attributes = {}
-        self.async_write_ha_state()
-
-    def _set_unavailable(self, cause: str = "Unknown"):
-        """Set switch as unavailable."""
-        self._unavailable_counter += 1
-
-        self._attr_extra_state_attributes = {
-            "unavailable_counter": self._unavailable_counter,
-            "unavailable_cause": cause,
-        }
-
-        if self._unavailable_counter >= 5:
-            self._attr_available = False
+    def _current_value(self) -> str | None:
+        return self._attr_current_option
 
-        self.async_write_ha_state()
+    def _update_from_coordinator(self) -> None:
+        """Update availability, attributes and value from the coordinator data."""
+        response_data = self._coordinator_value()
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-
-        if self.coordinator.data is None:
-            self._logger.debug(
-                "Data from coordinator is None",
-            )
-            self._set_unavailable("Data is None")
-            return
-
-        self._logger.debug(
-            "Updating state of %s", unique_id_logable(self._attr_unique_id)
-        )
-        if not isinstance(self.coordinator.data, dict):
-            self._logger.debug(
-                "Invalid data from coordinator (select.%s)",
-                unique_id_logable(self._attr_unique_id),
-            )
-            self._set_unavailable("Invalid data")
-            return
-
-        response_data = self.coordinator.data.get(self._response_key)
         if response_data is None:
-            self._set_unavailable("No data")
             return
 
         if not isinstance(response_data, self._field.e):
-            self._logger.warning(
-                "Invalid response data type from coordinator (select.%s): %s",
-                unique_id_logable(self._attr_unique_id),
-                response_data,
-            )
-            self._set_unavailable("Invalid data type")
+            self._set_invalid_type(response_data)
             return
 
         self._set_available()
-        self.current_option = response_data.name
-        self.async_write_ha_state()
+        self._attr_current_option = response_data.name
 
     async def async_select_option(self, option: str):
         """Set the entity to value."""
@@ -189,33 +128,10 @@ class BluettiSelect(CoordinatorEntity, SelectEntity):
     async def write_to_device(self, state: str):
         """Write to device."""
 
-        try:
-            device = await BleakScanner.find_device_by_address(self._address, timeout=5)
-
-            if device is None:
-                return
-
-            client = await establish_connection(
-                BleakClientWithServiceCache,
-                device,
-                device.name or "Unknown Device",
-                max_attempts=10,
+        if not await self._write_queue.async_write(self._field, state):
+            self._logger.error(
+                "Writing %s to %s on %s failed",
+                state,
+                self._response_key,
+                mac_loggable(self._address),
             )
-
-            if not client.is_connected:
-                return
-
-            writer = DeviceWriter(client, self._bluetti_device, lock=self._lock)
-
-            async with async_timeout.timeout(15):
-                # Send command
-                await writer.write(self._field.name, state)
-
-                # Wait until device has changed value, otherwise reading register might reset it
-                await asyncio.sleep(5)
-
-        except TimeoutError:
-            self._logger.error("Timed out for device %s", mac_loggable(self._address))
-            return None
-
-        await self.coordinator.async_request_refresh()
@@ -1,24 +1,41 @@
 """Bluetti BT sensors."""
 
 from __future__ import annotations
-from enum import Enum
+from dataclasses import dataclass
 import logging
-from decimal import Decimal
-from typing import List
-from homeassistant.components.sensor import SensorEntity
+from operator import itemgetter
+import re
+from typing import Any, Callable, List, Mapping
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.const import EntityCategory
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.const import (
+    PERCENTAGE,
+    SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+    EntityCategory,
+    Platform,
+    UnitOfInformation,
+    UnitOfTime,
+)
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from bluetti_bt_lib import build_device, FieldName, get_unit
+from homeassistant.helpers.event import async_call_later
+from bluetti_bt_lib import FieldName
 
 from . import device_info as dev_info, get_unique_id, FullDeviceConfig
-from .const import DATA_COORDINATOR, DOMAIN, MANUFACTURER
-from .coordinator import PollingCoordinator
-from .utils import mac_loggable, unique_id_logable
-from .types import get_device_class, get_state_class, get_category
+from .const import DATA_COORDINATOR, DATA_DESCRIPTION, DEADBAND_HEARTBEAT, DOMAIN
+from .coordinator import PollingCoordinator, PollRecord
+from .descriptions import same_value
+from .entity import NO_ATTRIBUTES, BluettiEntity
+from .packs import PackTracker
+from .types import Deadband
+from .utils import mac_loggable
 
 
 async def async_setup_entry(
@@ -28,6 +45,7 @@ async def async_setup_entry(
 
     config = FullDeviceConfig.from_dict(entry.data)
     coordinator = hass.data[DOMAIN][entry.entry_id][DATA_COORDINATOR]
+    description = hass.data[DOMAIN][entry.entry_id][DATA_DESCRIPTION]
 
     logger = logging.getLogger(
         f"{__name__}.{mac_loggable(config.address).replace(':', '_')}"
@@ -42,36 +60,31 @@ async def async_setup_entry(
     device_info = dev_info(entry)
 
     # Add sensors
-    bluetti_device = build_device(config.name)
-
     sensors_to_add = []
-    sensor_fields = bluetti_device.get_sensor_fields()
+    sensor_fields = description.sensor_fields
 
     if config.use_encryption:
-        sensor_fields = sensor_fields + bluetti_device.get_select_fields()
+        sensor_fields = sensor_fields + description.select_fields
 
     for field in sensor_fields:
-        field_name = FieldName(field.name)
-
-        if field_name in [FieldName.PACK_CELL_VOLTAGES, FieldName.PACK_SELECTED]:
+        if field.field_name in [FieldName.PACK_CELL_VOLTAGES, FieldName.PACK_SELECTED]:
             continue
 
-        unit = get_unit(field_name)
-        device_class = get_device_class(field_name)
-        state_class = get_state_class(field_name)
-        category = None if config.use_encryption else get_category(field_name)
+        category = None if config.use_encryption else field.category
 
-        if unit is not None:
+        if field.unit is not None:
             sensors_to_add.append(
                 BluettiSensor(
                     coordinator,
                     device_info,
                     field.address,
                     field.name,
-                    unit_of_measurement=unit,
-                    device_class=device_class,
-                    state_class=state_class,
+                    unit_of_measurement=field.unit,
+                    device_class=field.device_class,
+                    state_class=field.state_class,
                     category=category,
+                    converter=field.converter,
+                    deadband=field.deadband,
                     logger=logger,
                 )
             )
@@ -83,84 +96,159 @@ async def async_setup_entry(
                     field.address,
                     field.name,
                     category=category,
+                    converter=field.converter,
+                    deadband=field.deadband,
                     logger=logger,
                 )
             )
 
-    # Pack fields
-    for field in bluetti_device.pack_fields:
-        field_name = FieldName(field.name)
+    # Link quality, connect time and traffic are unknown for encrypted
+    # devices as their reader connects on its own
+    sensors_to_add.extend(
+        BluettiLinkSensor(coordinator, device_info, description)
+        for description in LINK_SENSORS
+        if not (description.shared_connection and config.use_encryption)
+    )
 
-        if field_name in [FieldName.PACK_SELECTED]:
-            continue
+    async_add_entities(sensors_to_add)
 
-        unit = get_unit(field_name)
-        device_class = get_device_class(field_name)
-        state_class = get_state_class(field_name)
-        category = get_category(field_name)
-
-        for num in range(1, bluetti_device.max_packs + 1):
-            main_name = dev_info(entry).get("name")
-            device_info = DeviceInfo(
-                identifiers={(DOMAIN, f"{config.address}_pack_{num}")},
-                name=f"{main_name} Battery Pack {num}",
-                manufacturer=MANUFACTURER,
-            )
+    if coordinator.bluetti_device.max_packs == 0:
+        return None
+
+    def create_pack_sensors(
+        num: int, pack_device_info: DeviceInfo
+    ) -> List[BluettiSensor]:
+        """Create the sensors of an attached battery pack."""
+        pack_sensors = []
 
-            if field_name == FieldName.PACK_CELL_VOLTAGES:
+        for field in description.pack_fields:
+            if field.field_name in [FieldName.PACK_SELECTED]:
+                continue
+
+            if field.field_name == FieldName.PACK_CELL_VOLTAGES:
                 # Special case: list of cell voltages
-                for cell_num in range(1, field.size + 1):
-                    sensors_to_add.append(
+                if not config.cell_voltage_entities:
+                    pack_sensors.append(
+                        BluettiCellVoltageSensor(
+                            coordinator,
+                            pack_device_info,
+                            field.address,
+                            field.name,
+                            unit_of_measurement=field.unit,
+                            device_class=field.device_class,
+                            state_class=field.state_class,
+                            category=field.category,
+                            pack_num=num,
+                            deadband=field.deadband,
+                            logger=logger,
+                        )
+                    )
+                    continue
+
+                for cell_num in range(1, field.field.size + 1):
+                    pack_sensors.append(
                         BluettiSensor(
                             coordinator,
-                            device_info,
+                            pack_device_info,
                             field.address,
                             field.name,
-                            unit_of_measurement=unit,
-                            device_class=device_class,
-                            state_class=state_class,
-                            category=category,
+                            unit_of_measurement=field.unit,
+                            device_class=field.device_class,
+                            state_class=field.state_class,
+                            category=field.category,
                             pack_num=num,
                             cell_num=cell_num,
+                            deadband=field.deadband,
                             logger=logger,
                         )
                     )
                 continue
 
-            if unit is not None:
-                sensors_to_add.append(
+            if field.unit is not None:
+                pack_sensors.append(
                     BluettiSensor(
                         coordinator,
-                        device_info,
+                        pack_device_info,
                         field.address,
                         field.name,
-                        unit_of_measurement=unit,
-                        device_class=device_class,
-                        state_class=state_class,
-                        category=category,
+                        unit_of_measurement=field.unit,
+                        device_class=field.device_class,
+                        state_class=field.state_class,
+                        category=field.category,
                         pack_num=num,
+                        converter=field.converter,
+                        deadband=field.deadband,
                         logger=logger,
                     )
                 )
             else:
-                sensors_to_add.append(
+                pack_sensors.append(
                     BluettiSensor(
                         coordinator,
-                        device_info,
+                        pack_device_info,
                         field.address,
                         field.name,
-                        category=category,
+                        category=field.category,
                         pack_num=num,
+                        converter=field.converter,
+                        deadband=field.deadband,
                         logger=logger,
                     )
                 )
 
-    async_add_entities(sensors_to_add)
+        return pack_sensors
+
+    # Entities of the cell voltage representation not in use are left over
+    # after the option was changed
+    _async_remove_cell_voltage_entities(hass, entry, config.cell_voltage_entities)
 
+    # Pack sensors are added once a pack is attached
+    pack_tracker = PackTracker(
+        hass,
+        coordinator,
+        device_info,
+        create_pack_sensors,
+        async_add_entities,
+        logger=logger,
+    )
+    entry.async_on_unload(pack_tracker.async_start())
+
+
+@callback
+def _async_remove_cell_voltage_entities(
+    hass: HomeAssistant, entry: ConfigEntry, cell_voltage_entities: bool
+) -> None:
+    """Remove the per cell sensors or the spread sensors from the registry."""
+    registry = er.async_get(hass)
+    cell_sensor = re.compile(rf"_{FieldName.PACK_CELL_VOLTAGES.value}_\d+$")
 
-class BluettiSensor(CoordinatorEntity, SensorEntity):
+    for entity in er.async_entries_for_config_entry(registry, entry.entry_id):
+        if entity.domain != Platform.SENSOR:
+            continue
+
+        if cell_voltage_entities:
+            stale = entity.unique_id.endswith("_cell_voltage_spread")
+        else:
+            stale = cell_sensor.search(entity.unique_id) is not None
+
+        if stale:
+            registry.async_remove(entity.entity_id)
+
+
+class BluettiSensor(BluettiEntity, SensorEntity):
     """Bluetti universal sensor."""
 
+    __slots__ = (
+        "_address",
+        "_pack_num",
+        "_cell_num",
+        "_options",
+        "_converter",
+        "_deadband",
+        "_written_at",
+        "_unsub_delayed_write",
+    )
+
     def __init__(
         self,
         coordinator: PollingCoordinator,
@@ -174,26 +262,33 @@ class BluettiSensor(CoordinatorEntity, SensorEntity):
         options: list[str] | None = None,
         pack_num: int | None = None,
         cell_num: int | None = None,
+        converter: Callable[[Any], Any] = same_value,
+        deadband: Deadband | None = None,
         logger: logging.Logger = logging.getLogger(),
     ):
         """Init sensor entity."""
-        super().__init__(coordinator)
-        self.coordinator = coordinator
+        super().__init__(
+            coordinator,
+            f"pack_{pack_num}_{response_key}" if pack_num else response_key,
+            logger,
+        )
         self._pack_num = pack_num
         self._cell_num = cell_num
-        self._logger = logger
+        self._converter = converter
+        self._deadband = deadband
+        self._written_at: float | None = None
+        self._unsub_delayed_write: CALLBACK_TYPE | None = None
+
+        if cell_num is not None:
+            # Single cell of a list of cell voltages
+            self._converter = itemgetter(cell_num - 1)
 
-        self._attr_has_entity_name = True
         e_name = f"{device_info.get('name')} {response_key}"
 
         if cell_num is not None:
             e_name = f"{device_info.get('name')} {response_key} {cell_num}"
 
         self._address = address
-        self._response_key = (
-            f"pack_{pack_num}_{response_key}" if pack_num else response_key
-        )
-        self._unavailable_counter = 0
 
         self._attr_device_info = device_info
         self._attr_translation_key = (
@@ -204,7 +299,6 @@ class BluettiSensor(CoordinatorEntity, SensorEntity):
             self._attr_translation_key = f"pack_{response_key}"
             self._attr_translation_placeholders = {"cell_num": cell_num}
 
-        self._attr_available = False
         self._attr_unique_id = get_unique_id(e_name)
         self._attr_native_unit_of_measurement = unit_of_measurement
         self._attr_device_class = device_class
@@ -212,93 +306,317 @@ class BluettiSensor(CoordinatorEntity, SensorEntity):
         self._attr_entity_category = category
         self._options = options
 
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return self._attr_available
-
-    def _set_available(self):
-        """Set sensor as available."""
-        self._attr_available = True
-        self._unavailable_counter = 0
-        self._attr_extra_state_attributes = {}
-        self.async_write_ha_state()
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to updates and show the current data."""
+        self.async_on_remove(self._cancel_delayed_write)
+        await super().async_added_to_hass()
 
-    def _set_unavailable(self, cause: str = "Unknown"):
-        """Set sensor as unavailable."""
-        self._unavailable_counter += 1
+    def _current_value(self) -> Any:
+        return self._attr_native_value
 
-        self._attr_extra_state_attributes = {
-            "unavailable_counter": self._unavailable_counter,
-            "unavailable_cause": cause,
-        }
+    def _should_write(self, previous: tuple, current: tuple) -> bool:
+        """Hold back value changes within the deadband or the minimum interval.
 
-        if self._unavailable_counter >= 5:
-            self._attr_available = False
+        A held back value is reverted, so the next update is compared to the
+        written value and slow drifts are not lost. Listeners are only called
+        for changed data, so a held back value is written by a timer at the
+        latest after DEADBAND_HEARTBEAT seconds, even if it stays the same.
+        """
+        now = self.hass.loop.time()
 
-        self.async_write_ha_state()
+        if (
+            self._deadband is None
+            or self._written_at is None
+            or previous[:2] != current[:2]
+        ):
+            return self._written(now)
+
+        if (
+            not self._deadband.exceeded(previous[2], current[2])
+            and now - self._written_at < DEADBAND_HEARTBEAT
+        ):
+            self._restore_value(previous[2])
+            if self._unsub_delayed_write is None:
+                self._unsub_delayed_write = async_call_later(
+                    self.hass,
+                    self._written_at + DEADBAND_HEARTBEAT - now,
+                    self._delayed_write,
+                )
+            return False
+
+        wait = self._written_at + self._deadband.min_interval - now
+        if wait > 0:
+            self._restore_value(previous[2])
+            # Might replace the later heartbeat
+            self._cancel_delayed_write()
+            self._unsub_delayed_write = async_call_later(
+                self.hass, wait, self._delayed_write
+            )
+            return False
+
+        return self._written(now)
+
+    def _written(self, now: float) -> bool:
+        self._written_at = now
+        self._cancel_delayed_write()
+        return True
+
+    def _restore_value(self, value: Any) -> None:
+        """Go back to a value returned by `_current_value`."""
+        self._attr_native_value = value
 
     @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
+    def _delayed_write(self, _now) -> None:
+        """Write the value held back by the minimum interval or the deadband."""
+        self._unsub_delayed_write = None
 
-        if self.coordinator.data is None:
-            self._logger.debug(
-                "Data from coordinator is None",
-            )
-            self._set_unavailable("Data is None")
+        # Forces the write, unless the value is back to the written one
+        written_at, self._written_at = self._written_at, None
+        self._handle_coordinator_update()
+        if self._written_at is None:
+            self._written_at = written_at
+
+    @callback
+    def _cancel_delayed_write(self) -> None:
+        if self._unsub_delayed_write is not None:
+            self._unsub_delayed_write()
+            self._unsub_delayed_write = None
+
+    def _update_from_coordinator(self) -> None:
+        """Update availability, attributes and value from the coordinator data."""
+        response_data = self._coordinator_value()
+
+        if response_data is None:
             return
 
-        if not isinstance(self.coordinator.data, dict):
-            self._logger.warning(
-                "Invalid data from coordinator (sensor.%s)",
-                unique_id_logable(self._attr_unique_id),
-            )
-            self._set_unavailable("Invalid data")
+        try:
+            value = self._converter(response_data)
+        except IndexError:
+            self._set_unavailable("Invalid list length")
+            return
+        except (AttributeError, TypeError):
+            self._set_invalid_type(response_data)
             return
 
-        self._logger.debug(
-            "Coordinator data: %s",
-            self.coordinator.data,
+        self._set_available()
+        self._attr_native_value = value
+
+
+class BluettiCellVoltageSensor(BluettiSensor):
+    """Voltage spread of all cells of a battery pack.
+
+    The cell voltages and their statistics are exposed as attributes, so a
+    pack needs one entity instead of one per cell. The deadband applies to
+    each cell, the state is written if any of them changed enough.
+    """
+
+    __slots__ = ("_cells",)
+
+    _unrecorded_attributes = frozenset({"cells"})
+
+    def __init__(
+        self,
+        coordinator: PollingCoordinator,
+        device_info: DeviceInfo,
+        address,
+        response_key: str,
+        unit_of_measurement: str | None = None,
+        device_class: str | None = None,
+        state_class: str | None = None,
+        category: EntityCategory | None = None,
+        pack_num: int | None = None,
+        deadband: Deadband | None = None,
+        logger: logging.Logger = logging.getLogger(),
+    ):
+        """Init sensor entity."""
+        super().__init__(
+            coordinator,
+            device_info,
+            address,
+            response_key,
+            unit_of_measurement=unit_of_measurement,
+            device_class=device_class,
+            state_class=state_class,
+            category=category,
+            pack_num=pack_num,
+            deadband=deadband,
+            logger=logger,
         )
+        self._cells: tuple[float, ...] = ()
 
-        response_data = self.coordinator.data.get(self._response_key)
-        if response_data is None:
-            self._logger.debug("No data for available for (%s)", self._response_key)
-            self._set_unavailable("No data")
-            return
+        self._attr_translation_key = "pack_cell_voltage_spread"
+        self._attr_unique_id = get_unique_id(
+            f"{device_info.get('name')} cell_voltage_spread"
+        )
 
-        if (
-            not isinstance(response_data, int)
-            and not isinstance(response_data, float)
-            and not isinstance(response_data, complex)
-            and not isinstance(response_data, Decimal)
-            and not isinstance(response_data, Enum)
-            and not isinstance(response_data, str)
-            and not isinstance(response_data, List)
-        ):
-            self._logger.warning(
-                "Invalid response data type from coordinator (sensor.%s): %s has type %s",
-                unique_id_logable(self._attr_unique_id),
-                response_data,
-                type(response_data),
-            )
-            self._set_unavailable("Invalid data type")
+    def _update_from_coordinator(self) -> None:
+        """Update availability, attributes and value from the coordinator data."""
+        response_data = self._coordinator_value()
+
+        if response_data is None:
             return
 
-        if isinstance(response_data, List) and len(response_data) < self._cell_num:
-            self._set_unavailable("Invalid list length")
+        if not isinstance(response_data, List) or len(response_data) == 0:
+            self._set_invalid_type(response_data)
             return
 
         self._set_available()
+        self._cells = tuple(float(cell) for cell in response_data)
 
-        # Different for enum and numeric
-        if isinstance(response_data, Enum):
-            # Enum
-            self._attr_native_value = response_data.name
-        elif isinstance(response_data, List):
-            self._attr_native_value = response_data[self._cell_num - 1]
-        else:
-            # Numeric
-            self._attr_native_value = response_data
+    def _current_value(self) -> Any:
+        return self._cells
+
+    def _restore_value(self, value: Any) -> None:
+        self._cells = value
+
+    @property
+    def native_value(self) -> float | None:
+        if not self._cells:
+            return None
+        return round(max(self._cells) - min(self._cells), 3)
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any]:
+        # Unavailability is reported instead of the cells
+        if self._attr_extra_state_attributes is not NO_ATTRIBUTES or not self._cells:
+            return self._attr_extra_state_attributes
+
+        cells = self._cells
+        return {
+            "min": min(cells),
+            "max": max(cells),
+            "mean": round(sum(cells) / len(cells), 3),
+            "spread": self.native_value,
+            "cells": list(cells),
+        }
+
+
+@dataclass(frozen=True, kw_only=True)
+class LinkSensorDescription(SensorEntityDescription):
+    """Link quality sensor, the value is taken from the coordinator."""
+
+    value_fn: Callable[[PollingCoordinator], Any]
+    attributes_fn: Callable[[PollingCoordinator], dict] | None = None
+    shared_connection: bool = False
+    """Only known if the device is read through the connection pool"""
+
+
+def _round(value: float | None, digits: int = 2) -> float | None:
+    return None if value is None else round(value, digits)
+
+
+LINK_SENSORS = (
+    LinkSensorDescription(
+        key="link_poll_time",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+        value_fn=lambda c: _round(c.last_poll.read_time) if c.last_poll else None,
+        attributes_fn=lambda c: {
+            "median": _round(c.link_stats.percentile(0.5)),
+            "p95": _round(c.link_stats.percentile(0.95)),
+            "histogram": c.link_stats.histogram(),
+        },
+    ),
+    LinkSensorDescription(
+        key="link_connect_time",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+        shared_connection=True,
+        value_fn=lambda c: _round(c.connection.last_connect_time),
+    ),
+    LinkSensorDescription(
+        key="link_bytes",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_registry_enabled_default=False,
+        shared_connection=True,
+        value_fn=lambda c: c.connection.bytes_sent + c.connection.bytes_received,
+        attributes_fn=lambda c: {
+            "sent": c.connection.bytes_sent,
+            "received": c.connection.bytes_received,
+        },
+    ),
+    LinkSensorDescription(
+        key="link_retries",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+        value_fn=lambda c: c.retry.failures,
+        attributes_fn=lambda c: {"state": c.retry.state.value},
+    ),
+    LinkSensorDescription(
+        key="link_rssi",
+        native_unit_of_measurement=SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+        device_class=SensorDeviceClass.SIGNAL_STRENGTH,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+        value_fn=lambda c: c.connection.transport.rssi(c.config.address),
+    ),
+    LinkSensorDescription(
+        key="link_success_ratio",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda c: (
+            None
+            if c.link_stats.success_ratio is None
+            else round(c.link_stats.success_ratio * 100)
+        ),
+    ),
+)
+
+
+class BluettiLinkSensor(SensorEntity):
+    """Quality of the connection to a device, updated after every poll."""
+
+    entity_description: LinkSensorDescription
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _unrecorded_attributes = frozenset({"histogram"})
+
+    def __init__(
+        self,
+        coordinator: PollingCoordinator,
+        device_info: DeviceInfo,
+        description: LinkSensorDescription,
+    ):
+        """Init sensor entity."""
+        self.coordinator = coordinator
+        self.entity_description = description
+
+        self._attr_device_info = device_info
+        self._attr_translation_key = description.key
+        self._attr_unique_id = get_unique_id(
+            f"{device_info.get('name')} {description.key}"
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the polls of the coordinator."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_poll_listener(self._handle_poll)
+        )
+
+    @callback
+    def _handle_poll(self, record: PollRecord) -> None:
         self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        """Stay available while the device is not, that's what is measured."""
+        return True
+
+    @property
+    def native_value(self) -> Any:
+        return self.entity_description.value_fn(self.coordinator)
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self.coordinator)
@@ -0,0 +1,122 @@
+"""Last known data of a Bluetti device, kept across restarts."""
+
+from __future__ import annotations
+from decimal import Decimal
+from enum import Enum
+import logging
+import re
+from typing import Any, Dict
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from bluetti_bt_lib import BluettiDevice, DeviceField
+from bluetti_bt_lib.fields import (
+    DecimalArrayField,
+    DecimalField,
+    EnumField,
+    VersionField,
+)
+
+from .const import DOMAIN, SNAPSHOT_SAVE_DELAY
+
+STORAGE_VERSION = 1
+
+_PACK_KEY = re.compile(r"^pack_\d+_(.+)$")
+
+
+class Snapshot:
+    """Persist the coordinator data so it can be shown right after a restart.
+
+    Values are stored as JSON and converted back using the type of their
+    device field. Saving is delayed, so frequent polls cause few writes. A
+    pending save is written when the config entry is unloaded.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, device: BluettiDevice):
+        self.device = device
+        self.logger = logging.getLogger(__name__)
+        self._store = _store(hass, entry_id)
+        self._fields: Dict[str, DeviceField] = {
+            f.name: f for f in device.fields + device.pack_fields
+        }
+        self._pending: dict | None = None
+        self._unloaded = False
+
+    async def async_load(self) -> dict | None:
+        """Return the stored data, None if there is none."""
+        stored = await self._store.async_load()
+
+        if not isinstance(stored, dict) or not stored.get("data"):
+            return None
+
+        data = {}
+        for key, value in stored["data"].items():
+            field = self._field(key)
+
+            if field is None or value is None:
+                continue
+
+            try:
+                data[key] = _restore(field, value)
+            except (KeyError, ValueError, ArithmeticError):
+                self.logger.debug("Dropping stored value of %s", key)
+
+        return data or None
+
+    def async_schedule_save(self, data: dict | None) -> None:
+        """Save the data after SNAPSHOT_SAVE_DELAY seconds."""
+        if self._unloaded or not isinstance(data, dict):
+            return
+
+        self._pending = data
+        self._store.async_delay_save(self._stored_data, SNAPSHOT_SAVE_DELAY)
+
+    async def async_unload(self) -> None:
+        """Write a pending save right away, later data isn't saved anymore.
+
+        Otherwise the delayed save could write the file again after the
+        snapshot of a removed config entry was deleted.
+        """
+        self._unloaded = True
+
+        if self._pending is not None:
+            # Replaces the delayed save of the store
+            await self._store.async_save(self._stored_data())
+
+    def _stored_data(self) -> dict:
+        data, self._pending = self._pending, None
+        return {"data": {k: _serialize(v) for k, v in (data or {}).items()}}
+
+    def _field(self, key: str) -> DeviceField | None:
+        match = _PACK_KEY.match(key)
+        if match is not None and match.group(1) in self._fields:
+            return self._fields[match.group(1)]
+        return self._fields.get(key)
+
+
+async def async_remove_snapshot(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the stored data of a config entry."""
+    await _store(hass, entry_id).async_remove()
+
+
+def _store(hass: HomeAssistant, entry_id: str) -> Store:
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+
+
+def _serialize(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.name
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, list):
+        return [_serialize(v) for v in value]
+    return value
+
+
+def _restore(field: DeviceField, value: Any) -> Any:
+    if isinstance(field, EnumField):
+        return field.e[value]
+    if isinstance(field, DecimalArrayField):
+        return [Decimal(v) for v in value]
+    if isinstance(field, (DecimalField, VersionField)):
+        return Decimal(value)
+    return value
@@ -0,0 +1,82 @@
+"""How a Bluetti device is reached."""
+
+from __future__ import annotations
+from abc import ABC, abstractmethod
+import logging
+from typing import Callable
+from bleak import BleakClient
+from bleak.exc import BleakError
+from bleak_retry_connector import BleakClientWithServiceCache, establish_connection
+from homeassistant.components import bluetooth
+from homeassistant.core import HomeAssistant
+
+from .utils import mac_loggable
+
+
+class Transport(ABC):
+    """Finds devices and opens connections to them.
+
+    The connection pool and the coordinator only talk to devices through a
+    transport, so they can be run against something other than a bluetooth
+    adapter, like a simulated device.
+    """
+
+    @abstractmethod
+    def is_present(self, address: str) -> bool:
+        """Return if the device can currently be connected."""
+
+    @abstractmethod
+    async def async_connect(
+        self, address: str, disconnected_callback: Callable[[BleakClient], None]
+    ) -> BleakClient | None:
+        """Open a connection, returns None if the device can't be reached."""
+
+    def rssi(self, address: str) -> int | None:
+        """Return the last known signal strength of the device in dBm."""
+        return None
+
+
+class BluetoothTransport(Transport):
+    """Devices seen by the bluetooth adapters and proxies of Home Assistant."""
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self.logger = logging.getLogger(__name__)
+
+    def is_present(self, address: str) -> bool:
+        return bluetooth.async_address_present(self.hass, address, connectable=True)
+
+    def rssi(self, address: str) -> int | None:
+        service_info = bluetooth.async_last_service_info(
+            self.hass, address, connectable=True
+        )
+
+        if service_info is None:
+            return None
+
+        return service_info.rssi
+
+    async def async_connect(
+        self, address: str, disconnected_callback: Callable[[BleakClient], None]
+    ) -> BleakClient | None:
+        device = bluetooth.async_ble_device_from_address(
+            self.hass, address, connectable=True
+        )
+
+        if device is None:
+            self.logger.debug("Device %s not found", mac_loggable(address))
+            return None
+
+        try:
+            return await establish_connection(
+                BleakClientWithServiceCache,
+                device,
+                device.name or "Unknown Device",
+                disconnected_callback=disconnected_callback,
+                max_attempts=10,
+            )
+        except (BleakError, TimeoutError) as err:
+            self.logger.warning(
+                "Could not connect to %s: %s", mac_loggable(address), err
+            )
+            return None
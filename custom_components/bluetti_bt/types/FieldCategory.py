@@ -2,16 +2,16 @@ from homeassistant.const import EntityCategory
 from bluetti_bt_lib import FieldName
 
 
-DIAGNOSTICS = [
+DIAGNOSTICS = {
     FieldName.DEVICE_SN,
     FieldName.DEVICE_TYPE,
     FieldName.VER_ARM,
     FieldName.VER_DSP,
     FieldName.VER_BMS,
     FieldName.PACK_CELL_VOLTAGES,
-]
+}
 
-CONFIGS = [
+CONFIGS = {
     FieldName.CTRL_CHARGING_MODE,
     FieldName.CTRL_DISPLAY_TIMEOUT,
     FieldName.CTRL_ECO,
@@ -25,7 +25,7 @@ CONFIGS = [
     FieldName.CTRL_POWER_LIFTING,
     FieldName.CTRL_SPLIT_PHASE,
     FieldName.CTRL_UPS_MODE,
-]
+}
 
 
 def get_category(field: FieldName) -> EntityCategory | None:
@@ -0,0 +1,53 @@
+from dataclasses import dataclass
+from typing import Any, Dict
+from homeassistant.components.sensor import SensorDeviceClass
+from bluetti_bt_lib import FieldName
+
+
+@dataclass(frozen=True)
+class Deadband:
+    """Changes of a sensor value which are too small to be written."""
+
+    absolute: float = 0
+    relative: float = 0
+    """Fraction of the last written value"""
+    min_interval: float = 0
+    """Seconds between two writes"""
+
+    def exceeded(self, old: Any, new: Any) -> bool:
+        """Return if the change from old to new is worth a write.
+
+        Lists of values, e.g. cell voltages, change if any of their values does.
+        """
+        if isinstance(old, (list, tuple)) and isinstance(new, (list, tuple)):
+            return len(old) != len(new) or any(map(self.exceeded, old, new))
+
+        try:
+            change = abs(float(new) - float(old))
+            threshold = max(self.absolute, abs(float(old)) * self.relative)
+        except (TypeError, ValueError):
+            return True
+
+        # Tolerate float errors, e.g. 0.3 - 0.2 < 0.1
+        return change + 1e-9 >= threshold
+
+
+DEVICE_CLASS_DEADBAND: Dict[SensorDeviceClass, Deadband] = {
+    SensorDeviceClass.CURRENT: Deadband(absolute=0.1, min_interval=10),
+    SensorDeviceClass.FREQUENCY: Deadband(absolute=0.1, min_interval=30),
+    SensorDeviceClass.VOLTAGE: Deadband(relative=0.005, min_interval=10),
+}
+
+FIELD_DEADBAND: Dict[FieldName, Deadband] = {
+    # Cells differ by a few millivolts, relative to 3 V that is too coarse
+    FieldName.PACK_CELL_VOLTAGES: Deadband(absolute=0.005, min_interval=30),
+}
+
+
+def get_deadband(field: FieldName, device_class: str | None) -> Deadband | None:
+    deadband = FIELD_DEADBAND.get(field)
+
+    if deadband is None and device_class is not None:
+        deadband = DEVICE_CLASS_DEADBAND.get(SensorDeviceClass(device_class))
+
+    return deadband
@@ -0,0 +1,61 @@
+from enum import Enum
+from bluetti_bt_lib import FieldName
+
+
+class PollTier(Enum):
+    FAST = "fast"
+    SLOW = "slow"
+    STATIC = "static"
+
+
+STATIC_FIELDS = {
+    FieldName.DEVICE_SN,
+    FieldName.DEVICE_TYPE,
+    FieldName.VER_ARM,
+    FieldName.VER_DSP,
+    FieldName.VER_BMS,
+    FieldName.WIFI_NAME,
+    # Battery packs
+    FieldName.PACK_SN,
+    FieldName.PACK_TYPE,
+    FieldName.PACK_VER_BCU,
+    FieldName.PACK_VER_BMU,
+    FieldName.PACK_VER_SAFETY_MOD,
+    FieldName.PACK_VER_HV_MOD,
+}
+
+SLOW_FIELDS = {
+    FieldName.AC_OUTPUT_MODE,
+    FieldName.BATTERY_SOC,
+    FieldName.BATTERY_SOC_RANGE_END,
+    FieldName.BATTERY_SOC_RANGE_START,
+    FieldName.CTRL_CHARGING_MODE,
+    FieldName.CTRL_DISPLAY_TIMEOUT,
+    FieldName.CTRL_ECO_MIN_POWER_AC,
+    FieldName.CTRL_ECO_MIN_POWER_DC,
+    FieldName.CTRL_ECO_TIME_MODE,
+    FieldName.CTRL_ECO_TIME_MODE_AC,
+    FieldName.CTRL_ECO_TIME_MODE_DC,
+    FieldName.CTRL_LED_MODE,
+    FieldName.CTRL_SPLIT_PHASE_MODE,
+    FieldName.CTRL_UPS_MODE,
+    FieldName.GRID_FREQ_MAX_VALUE,
+    FieldName.GRID_FREQ_MIN_VALUE,
+    FieldName.GRID_VOLT_MAX_VAL,
+    FieldName.GRID_VOLT_MIN_VAL,
+    FieldName.POWER_GENERATION,
+    FieldName.TIME_REMAINING,
+    # Battery packs
+    FieldName.PACK_BATTERY_SOC,
+    FieldName.PACK_CELL_VOLTAGES,
+    FieldName.PACK_SELECTED,
+    FieldName.PACK_VOLTAGE,
+}
+
+
+def get_poll_tier(field: FieldName) -> PollTier:
+    if field in STATIC_FIELDS:
+        return PollTier.STATIC
+    if field in SLOW_FIELDS:
+        return PollTier.SLOW
+    return PollTier.FAST
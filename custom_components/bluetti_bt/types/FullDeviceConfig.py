@@ -17,6 +17,11 @@ class FullDeviceConfig:
         self.polling_interval = optional.polling_interval
         self.polling_timeout = optional.polling_timeout
         self.max_retries = optional.max_retries
+        self.persistent_connection = optional.persistent_connection
+        self.adaptive_polling = optional.adaptive_polling
+        self.polling_interval_min = optional.polling_interval_min
+        self.polling_interval_max = optional.polling_interval_max
+        self.cell_voltage_entities = optional.cell_voltage_entities
 
     @staticmethod
     def from_dict(raw: Dict[str, Any]):
@@ -4,10 +4,16 @@ import voluptuous as vol
 CONF_POLLING_INTERVAL = "polling_interval"
 CONF_POLLING_TIMEOUT = "polling_timeout"
 CONF_MAX_RETRIES = "max_retries"
+CONF_PERSISTENT_CONNECTION = "persistent_connection"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_POLLING_INTERVAL_MIN = "polling_interval_min"
+CONF_POLLING_INTERVAL_MAX = "polling_interval_max"
+CONF_CELL_VOLTAGE_ENTITIES = "cell_voltage_entities"
 
 ABORT_REASON_INTERVAL = "invalid_interval"
 ABORT_REASON_TIMEOUT = "invalid_timeout"
 ABORT_REASON_RETRIES = "invalid_retries"
+ABORT_REASON_INTERVAL_RANGE = "invalid_interval_range"
 
 
 class OptionalDeviceConfig:
@@ -16,10 +22,20 @@ class OptionalDeviceConfig:
         polling_interval: int,
         polling_timeout: int,
         max_retries: int,
+        persistent_connection: bool,
+        adaptive_polling: bool,
+        polling_interval_min: int,
+        polling_interval_max: int,
+        cell_voltage_entities: bool,
     ):
         self.polling_interval = polling_interval
         self.polling_timeout = polling_timeout
         self.max_retries = max_retries
+        self.persistent_connection = persistent_connection
+        self.adaptive_polling = adaptive_polling
+        self.polling_interval_min = polling_interval_min
+        self.polling_interval_max = polling_interval_max
+        self.cell_voltage_entities = cell_voltage_entities
 
     @staticmethod
     def from_dict(raw: Dict[str, Any]):
@@ -27,6 +43,11 @@ class OptionalDeviceConfig:
             raw.get(CONF_POLLING_INTERVAL, 20),
             raw.get(CONF_POLLING_TIMEOUT, 45),
             raw.get(CONF_MAX_RETRIES, 5),
+            raw.get(CONF_PERSISTENT_CONNECTION, False),
+            raw.get(CONF_ADAPTIVE_POLLING, False),
+            raw.get(CONF_POLLING_INTERVAL_MIN, 5),
+            raw.get(CONF_POLLING_INTERVAL_MAX, 120),
+            raw.get(CONF_CELL_VOLTAGE_ENTITIES, False),
         )
 
     def validate(self) -> str | None:
@@ -36,6 +57,13 @@ class OptionalDeviceConfig:
             return ABORT_REASON_TIMEOUT
         if self.max_retries < 1:
             return ABORT_REASON_RETRIES
+        if self.adaptive_polling and not (
+            5
+            <= self.polling_interval_min
+            <= self.polling_interval
+            <= self.polling_interval_max
+        ):
+            return ABORT_REASON_INTERVAL_RANGE
         return None
 
     @property
@@ -44,6 +72,11 @@ class OptionalDeviceConfig:
             CONF_POLLING_INTERVAL: self.polling_interval,
             CONF_POLLING_TIMEOUT: self.polling_timeout,
             CONF_MAX_RETRIES: self.max_retries,
+            CONF_PERSISTENT_CONNECTION: self.persistent_connection,
+            CONF_ADAPTIVE_POLLING: self.adaptive_polling,
+            CONF_POLLING_INTERVAL_MIN: self.polling_interval_min,
+            CONF_POLLING_INTERVAL_MAX: self.polling_interval_max,
+            CONF_CELL_VOLTAGE_ENTITIES: self.cell_voltage_entities,
         }
 
     @property
@@ -62,5 +95,25 @@ class OptionalDeviceConfig:
                     CONF_MAX_RETRIES,
                     default=self.max_retries,
                 ): int,
+                vol.Required(
+                    CONF_PERSISTENT_CONNECTION,
+                    default=self.persistent_connection,
+                ): bool,
+                vol.Required(
+                    CONF_ADAPTIVE_POLLING,
+                    default=self.adaptive_polling,
+                ): bool,
+                vol.Required(
+                    CONF_POLLING_INTERVAL_MIN,
+                    default=self.polling_interval_min,
+                ): int,
+                vol.Required(
+                    CONF_POLLING_INTERVAL_MAX,
+                    default=self.polling_interval_max,
+                ): int,
+                vol.Required(
+                    CONF_CELL_VOLTAGE_ENTITIES,
+                    default=self.cell_voltage_entities,
+                ): bool,
             }
         )
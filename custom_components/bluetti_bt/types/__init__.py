@@ -4,5 +4,7 @@ from .ManufacturerData import *
 from .OptionalDeviceConfig import *
 
 from .FieldCategory import *
+from .FieldDeadband import *
 from .FieldDeviceClass import *
 from .FieldStateClass import *
+from .FieldPollTier import *
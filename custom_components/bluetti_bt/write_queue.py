@@ -0,0 +1,140 @@
+"""Write queue for Bluetti controls."""
+
+from __future__ import annotations
+import asyncio
+import logging
+from typing import Any, Dict, List, Tuple
+import async_timeout
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from bluetti_bt_lib import BluettiDevice, DeviceField, DeviceWriter
+from bluetti_bt_lib.fields import SelectField
+
+from .connection import ConnectionPool
+from .const import WRITE_QUEUE_WINDOW
+from .coordinator import PollingCoordinator
+from .utils import mac_loggable
+
+
+class WriteQueue:
+    """Collects writes to a device and sends them in batches.
+
+    Writes arriving within WRITE_QUEUE_WINDOW of the first pending write are
+    sent over a single session, repeated writes to the same field only send
+    the last value. The batch is verified with one read-back of all written
+    registers.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: PollingCoordinator,
+        bluetti_device: BluettiDevice,
+        connection: ConnectionPool,
+        lock: asyncio.Lock,
+    ):
+        self.hass = hass
+        self.coordinator = coordinator
+        self.bluetti_device = bluetti_device
+        self.connection = connection
+        self.lock = lock
+        self.logger = logging.getLogger(
+            f"{__name__}.{mac_loggable(connection.address).replace(':', '_')}"
+        )
+
+        self._pending: Dict[str, Tuple[DeviceField, Any]] = {}
+        self._waiters: List[asyncio.Future[bool]] = []
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        self._flush_lock = asyncio.Lock()
+
+    async def async_write(self, field: DeviceField, value: Any) -> bool:
+        """Queue a write and wait until its batch was sent and verified."""
+        self._pending[field.name] = (field, value)
+
+        waiter: asyncio.Future[bool] = self.hass.loop.create_future()
+        self._waiters.append(waiter)
+
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self.hass, WRITE_QUEUE_WINDOW, self._schedule_flush
+            )
+
+        return await waiter
+
+    @callback
+    def _schedule_flush(self, _now) -> None:
+        self._unsub_flush = None
+        self.hass.async_create_task(self._async_flush())
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop pending writes, their callers are told the writes failed."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+
+        self._pending = {}
+        _resolve(self._waiters, False)
+        self._waiters = []
+
+    async def _async_flush(self) -> None:
+        """Send all pending writes."""
+        async with self._flush_lock:
+            pending = list(self._pending.values())
+            waiters = self._waiters
+            self._pending = {}
+            self._waiters = []
+            success = False
+
+            try:
+                success = await self._async_send(pending)
+            except Exception:  # pylint: disable=broad-except
+                self.logger.exception(
+                    "Writing to device %s failed",
+                    mac_loggable(self.connection.address),
+                )
+            finally:
+                _resolve(waiters, success)
+
+    async def _async_send(self, pending: List[Tuple[DeviceField, Any]]) -> bool:
+        """Write and verify a batch of values."""
+        self.logger.debug("Writing %s fields", len(pending))
+
+        async with self.connection.session() as client:
+            if client is None:
+                self.logger.error(
+                    "Could not connect to device %s",
+                    mac_loggable(self.connection.address),
+                )
+                return False
+
+            writer = DeviceWriter(client, self.bluetti_device, lock=self.lock)
+
+            for field, value in pending:
+                try:
+                    async with async_timeout.timeout(15):
+                        await writer.write(field.name, value)
+                except TimeoutError:
+                    self.logger.error(
+                        "Timed out for device %s",
+                        mac_loggable(self.connection.address),
+                    )
+                    await self.coordinator.async_request_refresh()
+                    return False
+
+            return await self.coordinator.async_verify_writes(
+                [(field, _parsed_value(field, value)) for field, value in pending]
+            )
+
+
+def _resolve(waiters: List[asyncio.Future[bool]], success: bool) -> None:
+    for waiter in waiters:
+        if not waiter.done():
+            waiter.set_result(success)
+
+
+def _parsed_value(field: DeviceField, value: Any) -> Any:
+    """Return the value as the device field will parse it on read."""
+    if isinstance(field, SelectField) and isinstance(value, str):
+        return field.e[value]
+    return value
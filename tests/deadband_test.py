@@ -0,0 +1,38 @@
+import unittest
+from decimal import Decimal
+
+from bluetti_bt_lib import FieldName
+
+from custom_components.bluetti_bt.types import Deadband, get_deadband
+
+
+class TestDeadband(unittest.TestCase):
+    def test_absolute(self):
+        deadband = Deadband(absolute=0.1)
+
+        self.assertFalse(deadband.exceeded(Decimal("50.00"), Decimal("50.05")))
+        self.assertTrue(deadband.exceeded(Decimal("0.2"), Decimal("0.3")))
+        self.assertTrue(deadband.exceeded(50, None))
+
+    def test_relative(self):
+        deadband = Deadband(relative=0.005)
+
+        self.assertFalse(deadband.exceeded(230, 231))
+        self.assertTrue(deadband.exceeded(230, 232))
+
+    def test_lists(self):
+        deadband = Deadband(absolute=0.005)
+        cells = [Decimal("3.301"), Decimal("3.302")]
+
+        self.assertFalse(deadband.exceeded(cells, [Decimal("3.303"), Decimal("3.3")]))
+        self.assertTrue(deadband.exceeded(cells, [Decimal("3.301"), Decimal("3.31")]))
+        self.assertTrue(deadband.exceeded(cells, cells[:1]))
+
+    def test_defaults(self):
+        self.assertEqual(
+            get_deadband(FieldName.AC_INPUT_FREQUENCY, "frequency").absolute, 0.1
+        )
+        self.assertEqual(
+            get_deadband(FieldName.PACK_CELL_VOLTAGES, "voltage").absolute, 0.005
+        )
+        self.assertIsNone(get_deadband(FieldName.AC_INPUT_POWER, "power"))
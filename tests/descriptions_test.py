@@ -0,0 +1,60 @@
+import unittest
+from decimal import Decimal
+
+from homeassistant.const import EntityCategory
+from bluetti_bt_lib import FieldName
+from bluetti_bt_lib.devices import AC300
+
+from custom_components.bluetti_bt.descriptions import get_device_description
+
+
+class TestDeviceDescription(unittest.TestCase):
+    def test_built_once_per_model(self):
+        first = get_device_description("AC300", AC300())
+        second = get_device_description("AC300", AC300())
+
+        self.assertIs(first, second)
+
+    def test_field_metadata(self):
+        description = get_device_description("AC300", AC300())
+        fields = {field.field_name: field for field in description.sensor_fields}
+
+        self.assertEqual(fields[FieldName.AC_OUTPUT_POWER].unit, "W")
+        self.assertEqual(fields[FieldName.AC_OUTPUT_POWER].device_class, "power")
+        self.assertEqual(
+            fields[FieldName.DEVICE_SN].category, EntityCategory.DIAGNOSTIC
+        )
+        self.assertEqual(len(description.pack_fields), len(AC300().pack_fields))
+
+    def test_converter_by_field_type(self):
+        description = get_device_description("AC300", AC300())
+        fields = {field.field_name: field for field in description.sensor_fields}
+
+        mode = fields[FieldName.AC_OUTPUT_MODE]
+        self.assertEqual(mode.converter(mode.field.e(1)), mode.field.e(1).name)
+        self.assertEqual(fields[FieldName.AC_OUTPUT_POWER].converter(120), 120)
+        with self.assertRaises(AttributeError):
+            mode.converter(1)
+
+    def test_converter_rejects_wrong_type(self):
+        description = get_device_description("AC300", AC300())
+        fields = {field.field_name: field for field in description.sensor_fields}
+
+        voltage = fields[FieldName.AC_INPUT_VOLTAGE].converter
+        percent = fields[FieldName.BATTERY_SOC].converter
+        device_type = fields[FieldName.DEVICE_TYPE].converter
+
+        self.assertEqual(voltage(Decimal("230.1")), Decimal("230.1"))
+        self.assertEqual(percent(87), 87)
+        self.assertEqual(device_type("AC300"), "AC300")
+        with self.assertRaises(TypeError):
+            voltage("230.1")
+        with self.assertRaises(TypeError):
+            percent(True)
+        with self.assertRaises(TypeError):
+            device_type(b"AC300")
+
+        pack = {field.field_name: field for field in description.pack_fields}
+        cells = pack[FieldName.PACK_CELL_VOLTAGES].converter
+        with self.assertRaises(TypeError):
+            cells([Decimal("3.3"), None])
@@ -0,0 +1,74 @@
+import asyncio
+import tempfile
+import unittest
+
+from bluetti_bt_lib.devices import AC180
+from homeassistant.core import HomeAssistant
+
+from custom_components.bluetti_bt.connection import ConnectionPool
+from custom_components.bluetti_bt.fleet import Fleet
+from simulator import SimulatedDevice, SimulatedTransport
+
+
+class TestFleet(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.config_dir = tempfile.TemporaryDirectory()
+        self.hass = HomeAssistant(self.config_dir.name)
+
+        self.fleet = Fleet(self.hass, max_connections=1, spacing=0)
+        self.fleet.source = lambda address: "hci0"
+
+        devices = [
+            SimulatedDevice(AC180(), address=f"00:11:22:33:44:0{i}") for i in (1, 2)
+        ]
+        transport = SimulatedTransport(*devices)
+        self.pools = [
+            ConnectionPool(self.hass, device.address, True, self.fleet, transport)
+            for device in devices
+        ]
+
+    async def asyncTearDown(self):
+        for pool in self.pools:
+            await pool.async_close()
+        await self.hass.async_stop(force=True)
+        self.config_dir.cleanup()
+
+    async def test_persistent_connection_keeps_slot(self):
+        async with self.pools[0].session() as client:
+            self.assertIsNotNone(client)
+
+        self.assertTrue(self.pools[0].is_connected)
+        self.assertEqual(self.fleet.as_dict()["connections"], {"hci0": 1})
+
+        await self.pools[0].async_close()
+        self.assertEqual(self.fleet.as_dict()["connections"], {"hci0": 0})
+
+    async def test_idle_connection_is_evicted(self):
+        first, second = self.pools
+
+        async with first.session():
+            pass
+
+        async with asyncio.timeout(1):
+            async with second.session() as client:
+                self.assertIsNotNone(client)
+                self.assertFalse(first.is_connected)
+
+        self.assertTrue(second.is_connected)
+        self.assertEqual(self.fleet.as_dict()["connections"], {"hci0": 1})
+
+    async def test_busy_connection_gives_slot_to_waiting_device(self):
+        first, second = self.pools
+
+        async with first.session():
+            waiting = asyncio.create_task(self._async_session(second))
+            await asyncio.sleep(0)
+
+        async with asyncio.timeout(1):
+            self.assertTrue(await waiting)
+
+        self.assertFalse(first.is_connected)
+
+    async def _async_session(self, pool: ConnectionPool) -> bool:
+        async with pool.session() as client:
+            return client is not None
@@ -0,0 +1,32 @@
+import unittest
+
+from custom_components.bluetti_bt.link_stats import LinkStats
+
+
+class TestLinkStats(unittest.TestCase):
+    def setUp(self):
+        self.stats = LinkStats()
+
+    def test_empty(self):
+        self.assertIsNone(self.stats.success_ratio)
+        self.assertIsNone(self.stats.percentile(0.5))
+
+    def test_success_ratio(self):
+        self.stats.add(True, 1.5)
+        self.stats.add(False, 10)
+        self.stats.add(False)
+        self.stats.add(True, 0.4)
+
+        self.assertEqual(self.stats.success_ratio, 0.5)
+        self.assertEqual(self.stats.failed_polls, 2)
+
+    def test_histogram(self):
+        for poll_time in [0.2, 0.4, 1.5, 45]:
+            self.stats.add(True, poll_time)
+
+        histogram = self.stats.histogram()
+
+        self.assertEqual(histogram["0.5s"], 2)
+        self.assertEqual(histogram["2s"], 1)
+        self.assertEqual(histogram["slower"], 1)
+        self.assertEqual(self.stats.percentile(0.5), 1.5)
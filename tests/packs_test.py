@@ -0,0 +1,136 @@
+import asyncio
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from bluetti_bt_lib import FieldName
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+from custom_components.bluetti_bt.connection import ConnectionPool
+from custom_components.bluetti_bt.const import DOMAIN, PACK_RETIRE_TIMEOUT
+from custom_components.bluetti_bt.coordinator import PollingCoordinator
+from custom_components.bluetti_bt.packs import PackTracker
+from custom_components.bluetti_bt.sensor import _async_remove_cell_voltage_entities
+from custom_components.bluetti_bt.types import FullDeviceConfig
+
+
+class TestPackTracker(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.config_dir = tempfile.TemporaryDirectory()
+        self.hass = HomeAssistant(self.config_dir.name)
+        await dr.async_load(self.hass)
+        await er.async_load(self.hass)
+
+        config = FullDeviceConfig.from_dict(
+            {
+                "address": "00:11:22:33:44:55",
+                "name": "AC3001234567890123",
+                "type": "AC300",
+                "use_encryption": False,
+            }
+        )
+        self.coordinator = PollingCoordinator(
+            self.hass,
+            config,
+            asyncio.Lock(),
+            ConnectionPool(self.hass, config.address),
+        )
+
+        self.added = []
+        self.tracker = PackTracker(
+            self.hass,
+            self.coordinator,
+            {"name": "AC3001234567890123"},
+            lambda num, device_info: [(num, device_info["name"])],
+            self.added.extend,
+        )
+        self.unsub = self.tracker.async_start()
+
+    async def asyncTearDown(self):
+        self.unsub()
+        await self.coordinator.async_shutdown()
+        await self.hass.async_stop(force=True)
+        self.config_dir.cleanup()
+
+    def _set_voltages(self, **voltages):
+        self.coordinator.async_set_updated_data(
+            {
+                f"pack_{num[-1]}_{FieldName.PACK_VOLTAGE.value}": voltage
+                for num, voltage in voltages.items()
+            }
+        )
+
+    def test_adds_new_packs(self):
+        self.assertEqual(self.added, [])
+
+        self._set_voltages(pack1=52.1, pack2=0)
+        self.assertEqual(self.added, [(1, "AC3001234567890123 Battery Pack 1")])
+
+        self._set_voltages(pack1=52.2, pack2=0)
+        self.assertEqual(len(self.added), 1)
+
+        self._set_voltages(pack1=52.2, pack2=51.9)
+        self.assertEqual([num for num, _ in self.added], [1, 2])
+
+    def test_unread_packs_are_unknown(self):
+        self._set_voltages(pack3=52.1)
+
+        self.assertEqual([num for num, _ in self.added], [3])
+
+    def test_retires_detached_packs(self):
+        self._set_voltages(pack1=52.1)
+
+        now = self.hass.loop.time()
+        self._set_voltages(pack1=0)
+        self._set_voltages(pack1=52.1)
+
+        # Detached only briefly, the entities are kept
+        self.assertEqual([num for num, _ in self.added], [1])
+
+        self._set_voltages(pack1=0)
+        with patch.object(
+            self.hass.loop, "time", return_value=now + PACK_RETIRE_TIMEOUT + 1
+        ):
+            self._set_voltages(pack1=0.0)
+
+        # Attached again after it was removed, its entities are created again
+        self._set_voltages(pack1=52.1)
+        self.assertEqual([num for num, _ in self.added], [1, 1])
+
+    def test_removes_unused_cell_voltage_entities(self):
+        registry = er.async_get(self.hass)
+        entry = ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title="AC3001234567890123",
+            data={},
+            source="user",
+            options={},
+        )
+        pack = "ac3001234567890123_battery_pack_1"
+        for unique_id in [
+            f"{pack}_cell_voltages_1",
+            f"{pack}_cell_voltages_2",
+            f"{pack}_cell_voltage_spread",
+            f"{pack}_voltage",
+        ]:
+            registry.async_get_or_create(
+                "sensor", DOMAIN, unique_id, config_entry=entry
+            )
+
+        def unique_ids():
+            return sorted(
+                e.unique_id
+                for e in er.async_entries_for_config_entry(registry, entry.entry_id)
+            )
+
+        _async_remove_cell_voltage_entities(self.hass, entry, False)
+        self.assertEqual(
+            unique_ids(), [f"{pack}_cell_voltage_spread", f"{pack}_voltage"]
+        )
+
+        _async_remove_cell_voltage_entities(self.hass, entry, True)
+        self.assertEqual(unique_ids(), [f"{pack}_voltage"])
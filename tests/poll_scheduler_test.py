@@ -0,0 +1,96 @@
+import unittest
+
+from bluetti_bt_lib import FieldName
+from bluetti_bt_lib.devices import AC300
+
+from custom_components.bluetti_bt.const import SLOW_POLL_INTERVAL
+from custom_components.bluetti_bt.scheduler import AdaptiveInterval, PollScheduler
+from custom_components.bluetti_bt.types import PollTier
+
+
+class TestPollScheduler(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = PollScheduler(AC300())
+
+    def test_first_poll_reads_everything(self):
+        plan = self.scheduler.plan(0)
+
+        self.assertEqual(plan.tiers, [PollTier.FAST, PollTier.SLOW, PollTier.STATIC])
+        self.assertEqual(plan.view.packs, [1])
+        self.assertIn(FieldName.DEVICE_SN.value, plan.keys)
+        self.assertIn("pack_1_" + FieldName.PACK_VOLTAGE.value, plan.keys)
+        self.assertNotIn("pack_2_" + FieldName.PACK_VOLTAGE.value, plan.keys)
+
+    def test_fast_only_between_slow_polls(self):
+        self.scheduler.complete(self.scheduler.plan(0), True)
+        plan = self.scheduler.plan(SLOW_POLL_INTERVAL / 2)
+
+        self.assertEqual(plan.tiers, [PollTier.FAST])
+        self.assertEqual(plan.view.packs, [2])
+        self.assertIn(FieldName.AC_OUTPUT_POWER.value, plan.keys)
+        self.assertNotIn(FieldName.BATTERY_SOC.value, plan.keys)
+        self.assertNotIn(FieldName.DEVICE_SN.value, plan.keys)
+
+    def test_slow_poll_after_interval(self):
+        self.scheduler.complete(self.scheduler.plan(0), True)
+        plan = self.scheduler.plan(SLOW_POLL_INTERVAL)
+
+        self.assertEqual(plan.tiers, [PollTier.FAST, PollTier.SLOW])
+        self.assertIn(FieldName.BATTERY_SOC.value, plan.keys)
+
+    def test_failed_poll_reads_everything_again(self):
+        self.scheduler.complete(self.scheduler.plan(0), True)
+        self.scheduler.complete(self.scheduler.plan(1), False)
+        plan = self.scheduler.plan(2)
+
+        self.assertEqual(plan.tiers, [PollTier.FAST, PollTier.SLOW, PollTier.STATIC])
+
+    def test_packs_round_robin(self):
+        packs = []
+        for now in range(6):
+            plan = self.scheduler.plan(now)
+            self.scheduler.complete(plan, True)
+            packs.append(plan.view.packs)
+
+        self.assertEqual(packs, [[1], [2], [3], [4], [], []])
+        self.assertEqual(self.scheduler.plan(SLOW_POLL_INTERVAL + 1).view.packs, [1])
+
+    def test_held_fields_are_not_polled(self):
+        key = FieldName.CTRL_AC.value
+        self.scheduler.hold([key])
+        self.scheduler.hold([key])
+
+        self.assertNotIn(key, self.scheduler.plan(0).keys)
+
+        self.scheduler.release([key])
+        self.assertNotIn(key, self.scheduler.plan(1).keys)
+
+        self.scheduler.release([key])
+        self.assertIn(key, self.scheduler.plan(2).keys)
+
+
+class TestAdaptiveInterval(unittest.TestCase):
+    def setUp(self):
+        self.adaptive = AdaptiveInterval(AC300(), 5, 120, 20)
+        self.key = FieldName.AC_OUTPUT_POWER.value
+
+    def test_speeds_up_on_power_change(self):
+        interval = self.adaptive.update({self.key: 100}, {self.key: 600})
+        self.assertEqual(interval, 10)
+
+        interval = self.adaptive.update({self.key: 600}, {self.key: 100})
+        self.assertEqual(interval, 5)
+
+        interval = self.adaptive.update({self.key: 100}, {self.key: 600})
+        self.assertEqual(interval, 5)
+
+    def test_backs_off_while_idle(self):
+        interval = 20
+        for _ in range(50):
+            interval = self.adaptive.update({self.key: 100}, {self.key: 101})
+
+        self.assertEqual(interval, 120)
+
+    def test_ignores_missing_values(self):
+        interval = self.adaptive.update(None, {self.key: 600})
+        self.assertGreater(interval, 20)
@@ -0,0 +1,102 @@
+import asyncio
+import tempfile
+import unittest
+
+from bluetti_bt_lib.devices import AC180
+from homeassistant.core import HomeAssistant
+
+from custom_components.bluetti_bt.connection import ConnectionPool
+from custom_components.bluetti_bt.coordinator import PollingCoordinator
+from custom_components.bluetti_bt.entity import BluettiEntity
+from custom_components.bluetti_bt.profiler import Profiler
+from custom_components.bluetti_bt.sensor import (
+    LINK_SENSORS,
+    BluettiLinkSensor,
+    BluettiSensor,
+)
+from custom_components.bluetti_bt.switch import BluettiSwitch
+from custom_components.bluetti_bt.types import FullDeviceConfig
+from simulator import SimulatedDevice, SimulatedTransport
+
+
+class TestProfiler(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.config_dir = tempfile.TemporaryDirectory()
+        self.hass = HomeAssistant(self.config_dir.name)
+
+        device = SimulatedDevice(AC180(), latency=0.01)
+        config = FullDeviceConfig.from_dict(
+            {
+                "address": device.address,
+                "name": "AC1801234567890123",
+                "type": "AC180",
+                "use_encryption": False,
+            }
+        )
+        self.coordinator = PollingCoordinator(
+            self.hass,
+            config,
+            asyncio.Lock(),
+            ConnectionPool(
+                self.hass, config.address, transport=SimulatedTransport(device)
+            ),
+        )
+        self.profiler = Profiler()
+
+    async def asyncTearDown(self):
+        self.profiler.stop([self.coordinator])
+        await self.coordinator.async_shutdown()
+        await self.hass.async_stop(force=True)
+        self.config_dir.cleanup()
+
+    async def test_poll(self):
+        self.profiler.start([self.coordinator])
+        await self.coordinator._async_update_data()
+        await self.coordinator._async_update_data()
+
+        report = self.profiler.report()
+        timing = report["methods"]["coordinator._async_update_data"][
+            "AC1801234567890123"
+        ]
+
+        self.assertTrue(report["enabled"])
+        self.assertEqual(timing["calls"], 2)
+        # Waiting for the device doesn't block the event loop
+        self.assertLess(timing["loop"], timing["wall"])
+        self.assertEqual(report["devices"]["AC1801234567890123"]["calls"], 2)
+
+    async def test_profiles_added_listeners(self):
+        sensor = BluettiLinkSensor(self.coordinator, {}, LINK_SENSORS[0])
+        sensor.async_write_ha_state = lambda: None
+        remove = self.coordinator.async_add_poll_listener(sensor._handle_poll)
+
+        self.profiler.start([self.coordinator])
+        await self.coordinator._async_update_data()
+        self.profiler.stop([self.coordinator])
+        await self.coordinator._async_update_data()
+
+        timing = self.profiler.report()["methods"]["sensor._handle_poll"]
+        self.assertEqual(timing["AC1801234567890123"]["calls"], 1)
+
+        remove()
+        self.assertEqual(self.coordinator._poll_listeners, {})
+
+    async def test_stop_restores_methods(self):
+        update_data = PollingCoordinator._async_update_data
+        write = BluettiSwitch.write_to_device
+
+        self.profiler.start([self.coordinator])
+        self.assertIsNot(PollingCoordinator._async_update_data, update_data)
+        self.assertIn("_handle_coordinator_update", BluettiSensor.__dict__)
+
+        self.profiler.stop([self.coordinator])
+        await self.coordinator._async_update_data()
+
+        self.assertIs(PollingCoordinator._async_update_data, update_data)
+        self.assertIs(BluettiSwitch.write_to_device, write)
+        self.assertIs(
+            BluettiSensor._handle_coordinator_update,
+            BluettiEntity._handle_coordinator_update,
+        )
+        self.assertFalse(self.profiler.report()["enabled"])
+        self.assertEqual(self.profiler.report()["methods"], {})
@@ -0,0 +1,75 @@
+import tempfile
+import unittest
+from datetime import timedelta
+from unittest.mock import patch
+
+from bleak.backends.device import BLEDevice
+from bluetti_bt_lib import DeviceRecognizerResult
+from homeassistant.components.bluetooth import BluetoothServiceInfoBleak
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.bluetti_bt.const import RECOGNITION_CACHE_TTL
+from custom_components.bluetti_bt.recognition_cache import RecognitionCache
+
+ADDRESS = "00:11:22:33:44:55"
+
+
+def service_info(
+    name: str = "AC1801234567890123", manufacturer_data: bytes = b"\x01"
+) -> BluetoothServiceInfoBleak:
+    return BluetoothServiceInfoBleak(
+        name=name,
+        address=ADDRESS,
+        rssi=-60,
+        manufacturer_data={0x4254: manufacturer_data},
+        service_data={},
+        service_uuids=[],
+        source="hci0",
+        device=BLEDevice(ADDRESS, name, None),
+        advertisement=None,
+        connectable=True,
+        time=0,
+        tx_power=None,
+    )
+
+
+class TestRecognitionCache(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.config_dir = tempfile.TemporaryDirectory()
+        self.hass = HomeAssistant(self.config_dir.name)
+        self.cache = RecognitionCache(self.hass)
+        self.recognized = DeviceRecognizerResult("AC180", 1, False, 1234567890123)
+
+    async def asyncTearDown(self):
+        await self.hass.async_stop(force=True)
+        self.config_dir.cleanup()
+
+    async def test_miss(self):
+        self.assertIsNone(await self.cache.async_get(service_info()))
+
+    async def test_hit(self):
+        await self.cache.async_set(service_info(), self.recognized)
+
+        # Read back from storage, as after a restart
+        cached = await RecognitionCache(self.hass).async_get(service_info())
+
+        self.assertEqual(cached.name, "AC180")
+        self.assertEqual(cached.iot_version, 1)
+        self.assertFalse(cached.encrypted)
+        self.assertEqual(cached.sn, 1234567890123)
+
+    async def test_changed_advertisement_invalidates(self):
+        await self.cache.async_set(service_info(), self.recognized)
+
+        self.assertIsNone(
+            await self.cache.async_get(service_info(manufacturer_data=b"\x02"))
+        )
+        self.assertIsNone(await self.cache.async_get(service_info()))
+
+    async def test_expires(self):
+        await self.cache.async_set(service_info(), self.recognized)
+        later = dt_util.utcnow() + timedelta(seconds=RECOGNITION_CACHE_TTL + 1)
+
+        with patch.object(dt_util, "utcnow", return_value=later):
+            self.assertIsNone(await self.cache.async_get(service_info()))
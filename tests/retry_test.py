@@ -0,0 +1,64 @@
+import unittest
+
+from custom_components.bluetti_bt.const import (
+    RETRY_BASE_DELAY,
+    RETRY_BREAKER_TIMEOUT,
+    RETRY_MAX_DELAY,
+)
+from custom_components.bluetti_bt.retry import RetryEngine, RetryState
+
+
+class TestRetryEngine(unittest.TestCase):
+    def setUp(self):
+        self.retry = RetryEngine(5)
+
+    def test_backoff_grows_with_jitter(self):
+        for failures in range(1, 5):
+            delay = self.retry.failure(0)
+            full = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (failures - 1))
+
+            self.assertEqual(self.retry.state, RetryState.RETRYING)
+            self.assertGreaterEqual(delay, full / 2)
+            self.assertLessEqual(delay, full)
+
+    def test_breaker_opens_after_max_retries(self):
+        for _ in range(5):
+            delay = self.retry.failure(0)
+
+        self.assertEqual(self.retry.state, RetryState.OPEN)
+        self.assertEqual(delay, RETRY_BREAKER_TIMEOUT)
+        self.assertFalse(self.retry.allow(RETRY_BREAKER_TIMEOUT - 1))
+
+    def test_half_open_after_timeout(self):
+        for _ in range(5):
+            self.retry.failure(0)
+
+        self.assertTrue(self.retry.allow(RETRY_BREAKER_TIMEOUT))
+        self.assertEqual(self.retry.state, RetryState.HALF_OPEN)
+
+        self.retry.failure(RETRY_BREAKER_TIMEOUT)
+        self.assertEqual(self.retry.state, RetryState.OPEN)
+
+        self.assertTrue(self.retry.allow(2 * RETRY_BREAKER_TIMEOUT))
+        self.retry.success()
+        self.assertEqual(self.retry.state, RetryState.OK)
+        self.assertEqual(self.retry.failures, 0)
+
+    def test_half_open_when_absent_device_is_back(self):
+        for _ in range(5):
+            self.retry.failure(0, absent=True)
+
+        self.assertEqual(self.retry.state, RetryState.OPEN)
+        self.retry.present()
+
+        self.assertEqual(self.retry.state, RetryState.HALF_OPEN)
+        self.assertTrue(self.retry.allow(1))
+
+    def test_stays_open_for_present_device(self):
+        for _ in range(5):
+            self.retry.failure(0)
+
+        self.retry.present()
+
+        self.assertEqual(self.retry.state, RetryState.OPEN)
+        self.assertFalse(self.retry.allow(1))
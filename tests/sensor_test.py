@@ -0,0 +1,117 @@
+import asyncio
+import tempfile
+import unittest
+from decimal import Decimal
+from unittest.mock import patch
+
+from bluetti_bt_lib import FieldName
+from bluetti_bt_lib.devices import AC180
+from homeassistant.core import HomeAssistant
+
+from custom_components.bluetti_bt.connection import ConnectionPool
+from custom_components.bluetti_bt.coordinator import PollingCoordinator
+from custom_components.bluetti_bt.sensor import BluettiCellVoltageSensor, BluettiSensor
+from custom_components.bluetti_bt.types import Deadband, FullDeviceConfig
+from simulator import SimulatedDevice, SimulatedTransport
+
+KEY = FieldName.AC_INPUT_VOLTAGE.value
+
+
+class TestDeadbandSensor(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.config_dir = tempfile.TemporaryDirectory()
+        self.hass = HomeAssistant(self.config_dir.name)
+
+        device = SimulatedDevice(AC180())
+        config = FullDeviceConfig.from_dict(
+            {
+                "address": device.address,
+                "name": "AC1801234567890123",
+                "type": "AC180",
+                "use_encryption": False,
+            }
+        )
+        self.coordinator = PollingCoordinator(
+            self.hass,
+            config,
+            asyncio.Lock(),
+            ConnectionPool(
+                self.hass, config.address, transport=SimulatedTransport(device)
+            ),
+        )
+
+        self.sensor = BluettiSensor(
+            self.coordinator,
+            {"name": config.name},
+            0,
+            KEY,
+            deadband=Deadband(absolute=1),
+        )
+        self.sensor.hass = self.hass
+        self.written = []
+        self.sensor.async_write_ha_state = lambda: self.written.append(
+            self.sensor.native_value
+        )
+
+    async def asyncTearDown(self):
+        self.sensor._cancel_delayed_write()
+        await self.hass.async_stop(force=True)
+        self.config_dir.cleanup()
+
+    def _set_value(self, value: str):
+        self.coordinator.data = {KEY: Decimal(value)}
+        self.sensor._handle_coordinator_update()
+
+    async def test_steady_value_is_written_with_heartbeat(self):
+        with patch("custom_components.bluetti_bt.sensor.DEADBAND_HEARTBEAT", 0.1):
+            self._set_value("230.0")
+            self._set_value("230.5")
+
+            # Held back, and the coordinator won't report the same value again
+            self.assertEqual(self.written, [Decimal("230.0")])
+
+            await asyncio.sleep(0.15)
+
+        self.assertEqual(self.written, [Decimal("230.0"), Decimal("230.5")])
+
+    async def test_change_beyond_deadband_cancels_heartbeat(self):
+        with patch("custom_components.bluetti_bt.sensor.DEADBAND_HEARTBEAT", 0.1):
+            self._set_value("230.0")
+            self._set_value("230.5")
+            self._set_value("232.0")
+            await asyncio.sleep(0.15)
+
+        self.assertEqual(self.written, [Decimal("230.0"), Decimal("232.0")])
+
+    async def test_back_to_written_value(self):
+        with patch("custom_components.bluetti_bt.sensor.DEADBAND_HEARTBEAT", 0.1):
+            self._set_value("230.0")
+            self._set_value("230.5")
+            self.coordinator.data = {KEY: Decimal("230.0")}
+            await asyncio.sleep(0.15)
+
+        self.assertEqual(self.written, [Decimal("230.0")])
+
+    async def test_steady_cell_voltages_are_written_with_heartbeat(self):
+        sensor = BluettiCellVoltageSensor(
+            self.coordinator,
+            {"name": "AC1801234567890123"},
+            0,
+            FieldName.PACK_CELL_VOLTAGES.value,
+            pack_num=1,
+            deadband=Deadband(absolute=0.005),
+        )
+        sensor.hass = self.hass
+        written = []
+        sensor.async_write_ha_state = lambda: written.append(sensor.native_value)
+        key = f"pack_1_{FieldName.PACK_CELL_VOLTAGES.value}"
+
+        with patch("custom_components.bluetti_bt.sensor.DEADBAND_HEARTBEAT", 0.1):
+            for cells in (["3.300", "3.301"], ["3.300", "3.303"]):
+                self.coordinator.data = {key: [Decimal(cell) for cell in cells]}
+                sensor._handle_coordinator_update()
+
+            self.assertEqual(written, [0.001])
+            await asyncio.sleep(0.15)
+
+        self.assertEqual(written, [0.001, 0.003])
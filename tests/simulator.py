@@ -0,0 +1,275 @@
+"""Simulated Bluetti device to run the integration without hardware.
+
+A SimulatedDevice holds the registers of a device from bluetti_bt_lib and
+answers Modbus read and write commands like the real one. Its transport
+plugs into ConnectionPool (or hass.data[DOMAIN][DATA_TRANSPORT]) in place of
+bluetooth.
+
+Encrypted devices expect a key exchange before any command. It is not
+simulated, an encrypted device simply never answers plain commands.
+"""
+
+from __future__ import annotations
+import asyncio
+from decimal import Decimal
+from enum import Enum
+import random
+import struct
+from typing import Any, Callable, Dict, List
+from bleak.exc import BleakError
+from bluetti_bt_lib import BluettiDevice, DeviceField
+from bluetti_bt_lib.fields import (
+    BoolField,
+    DecimalArrayField,
+    DecimalField,
+    EnumField,
+    SerialNumberField,
+    StringField,
+    SwapStringField,
+    UIntField,
+    VersionField,
+)
+from bluetti_bt_lib.registers import RegisterAction, modbus_crc
+
+from custom_components.bluetti_bt.transport import Transport
+
+
+class SimulatedDevice:
+    """Registers of a device and the behaviour of its link."""
+
+    def __init__(
+        self,
+        device: BluettiDevice,
+        address: str = "00:11:22:33:44:55",
+        latency: float = 0,
+        packet_loss: float = 0,
+        disconnect_every: int | None = None,
+        encrypted: bool = False,
+        seed: int | None = None,
+    ):
+        self.device = device
+        self.address = address
+        self.latency = latency
+        """Seconds until a command is answered"""
+        self.packet_loss = packet_loss
+        """Share of commands which are never answered"""
+        self.disconnect_every = disconnect_every
+        """The link drops after this many commands"""
+        self.encrypted = encrypted
+        self.present = True
+        self.rssi = -60
+
+        self.commands = 0
+        self.writes = 0
+        self.connects = 0
+        self.bytes_received = 0
+        self.bytes_sent = 0
+
+        self._random = random.Random(seed)
+        self._clients: List[SimulatedClient] = []
+        self._registers: Dict[int, int] = {}
+        self._packs: Dict[int, Dict[int, int]] = {
+            pack: {} for pack in range(1, device.max_packs + 1)
+        }
+        self._pack_addresses = {
+            address
+            for field in device.pack_fields
+            for address in range(field.address, field.address + field.size)
+        }
+        self._pack_selector: int | None = None
+        self.selected_pack = 1
+
+        if device.max_packs > 0:
+            self._pack_selector = device.get_pack_selector(1).address
+
+        for field in device.fields:
+            if isinstance(field, EnumField):
+                self.set_value(field.name, next(iter(field.e)))
+        for field in device.pack_fields:
+            for pack in self._packs:
+                if isinstance(field, EnumField):
+                    self.set_value(field.name, next(iter(field.e)), pack)
+
+    def set_value(self, name: str, value: Any, pack: int | None = None) -> None:
+        """Store a value the way the device encodes it."""
+        fields = self.device.pack_fields if pack is not None else self.device.fields
+        field = next(f for f in fields if f.name == name)
+        registers = self._registers if pack is None else self._packs[pack]
+
+        for offset, word in enumerate(_encode(field, value)):
+            registers[field.address + offset] = word
+
+    def get_value(self, name: str, pack: int | None = None) -> Any:
+        """Return a value as the device would report it."""
+        fields = self.device.pack_fields if pack is not None else self.device.fields
+        field = next(f for f in fields if f.name == name)
+        registers = self._registers if pack is None else self._packs[pack]
+        words = [
+            registers.get(address, 0)
+            for address in range(field.address, field.address + field.size)
+        ]
+        return field.parse(struct.pack(f"!{field.size}H", *words))
+
+    def disconnect(self) -> None:
+        """Drop all connections, like the device moving out of range."""
+        for client in list(self._clients):
+            client.drop()
+
+    def handle(self, command: bytes) -> bytes | None:
+        """Return the response to a command, None if there is none."""
+        self.bytes_received += len(command)
+
+        if (
+            self.encrypted
+            or len(command) != 8
+            or command[-2:] != modbus_crc(command[:-2]).to_bytes(2, "little")
+            or self._random.random() < self.packet_loss
+        ):
+            return None
+
+        function = command[1]
+        address, value = struct.unpack_from("!HH", command, 2)
+
+        if function == RegisterAction.READ.value:
+            words = [self._read(a) for a in range(address, address + value)]
+            body = bytes([1, function, 2 * value]) + struct.pack(f"!{value}H", *words)
+        elif function == RegisterAction.WRITE.value:
+            self._write(address, value)
+            body = bytes(command[:-2])
+        else:
+            return None
+
+        response = body + modbus_crc(body).to_bytes(2, "little")
+        self.bytes_sent += len(response)
+        return response
+
+    def _read(self, address: int) -> int:
+        if address in self._pack_addresses and self.selected_pack in self._packs:
+            return self._packs[self.selected_pack].get(address, 0)
+        return self._registers.get(address, 0)
+
+    def _write(self, address: int, value: int) -> None:
+        self.writes += 1
+        if address == self._pack_selector:
+            self.selected_pack = value
+        self._registers[address] = value
+
+
+class SimulatedClient:
+    """Connection to a simulated device, in place of a BleakClient."""
+
+    def __init__(
+        self,
+        device: SimulatedDevice,
+        disconnected_callback: Callable[[Any], None] | None = None,
+    ):
+        self.device = device
+        self.address = device.address
+        self.is_connected = True
+        self._disconnected_callback = disconnected_callback
+        self._notify_callback: Callable | None = None
+
+    async def connect(self) -> None:
+        if not self.device.present:
+            raise BleakError("Device not found")
+        self.is_connected = True
+
+    async def disconnect(self) -> None:
+        self.is_connected = False
+        if self in self.device._clients:
+            self.device._clients.remove(self)
+
+    def drop(self) -> None:
+        """Lose the connection without being asked to."""
+        self.is_connected = False
+        if self in self.device._clients:
+            self.device._clients.remove(self)
+        if self._disconnected_callback is not None:
+            self._disconnected_callback(self)
+
+    async def start_notify(self, char_specifier: Any, callback: Callable, **kwargs):
+        self._notify_callback = callback
+
+    async def stop_notify(self, char_specifier: Any) -> None:
+        self._notify_callback = None
+
+    async def write_gatt_char(
+        self, char_specifier: Any, data: Any, response: bool | None = None
+    ) -> None:
+        if not self.is_connected:
+            raise BleakError("Not connected")
+
+        device = self.device
+        device.commands += 1
+
+        if device.disconnect_every and device.commands % device.disconnect_every == 0:
+            self.drop()
+            raise BleakError("Connection lost")
+
+        answer = device.handle(bytes(data))
+
+        if device.latency:
+            await asyncio.sleep(device.latency)
+
+        if answer is not None and self._notify_callback is not None:
+            await self._notify_callback(char_specifier, bytearray(answer))
+
+
+class SimulatedTransport(Transport):
+    """Reach simulated devices instead of bluetooth ones."""
+
+    def __init__(self, *devices: SimulatedDevice):
+        self.devices = {device.address: device for device in devices}
+
+    def is_present(self, address: str) -> bool:
+        device = self.devices.get(address)
+        return device is not None and device.present
+
+    def rssi(self, address: str) -> int | None:
+        if not self.is_present(address):
+            return None
+        return self.devices[address].rssi
+
+    async def async_connect(
+        self, address: str, disconnected_callback: Callable[[Any], None]
+    ) -> SimulatedClient | None:
+        if not self.is_present(address):
+            return None
+
+        device = self.devices[address]
+        device.connects += 1
+
+        if device.latency:
+            await asyncio.sleep(device.latency)
+
+        client = SimulatedClient(device, disconnected_callback)
+        device._clients.append(client)
+        return client
+
+
+def _encode(field: DeviceField, value: Any) -> List[int]:
+    """Return the register words of a value."""
+    if isinstance(field, EnumField):
+        if not isinstance(value, Enum):
+            value = field.e[value]
+        return [value.value]
+    if isinstance(field, BoolField):
+        return [1 if value else 0]
+    if isinstance(field, DecimalArrayField):
+        return [int(Decimal(v) * 10**field.scale) for v in value]
+    if isinstance(field, DecimalField):
+        return [int(Decimal(value) / Decimal(field.multiplier) * 10**field.scale)]
+    if isinstance(field, UIntField):
+        return [int(round(value / field.multiplier))]
+    if isinstance(field, VersionField):
+        raw = int(Decimal(value) * 100)
+        return [raw & 0xFFFF, raw >> 16]
+    if isinstance(field, SerialNumberField):
+        return [(value >> (16 * i)) & 0xFFFF for i in range(4)]
+    if isinstance(field, (StringField, SwapStringField)):
+        data = value.encode("ascii").ljust(2 * field.size, b"\0")
+        words = struct.unpack(f"!{field.size}H", data)
+        if isinstance(field, SwapStringField):
+            words = struct.unpack(f"<{field.size}H", data)
+        return list(words)
+    raise TypeError(f"Can't encode values of {type(field).__name__}")
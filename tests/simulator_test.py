@@ -0,0 +1,201 @@
+import asyncio
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from bluetti_bt_lib import FieldName
+from bluetti_bt_lib.devices import AC180
+from homeassistant.core import HomeAssistant
+
+from custom_components.bluetti_bt.connection import ConnectionPool
+from custom_components.bluetti_bt.coordinator import PollingCoordinator
+from custom_components.bluetti_bt.fleet import Fleet
+from custom_components.bluetti_bt.retry import RetryState
+from custom_components.bluetti_bt.types import FullDeviceConfig
+from custom_components.bluetti_bt.write_queue import WriteQueue
+from simulator import SimulatedDevice, SimulatedTransport
+
+
+class TestSimulatedDevice(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.config_dir = tempfile.TemporaryDirectory()
+        self.hass = HomeAssistant(self.config_dir.name)
+
+        self.device = SimulatedDevice(AC180())
+        self.device.set_value(FieldName.AC_OUTPUT_POWER.value, 230)
+        self.device.set_value(FieldName.AC_INPUT_FREQUENCY.value, "50.1")
+
+        config = FullDeviceConfig.from_dict(
+            {
+                "address": self.device.address,
+                "name": "AC1801234567890123",
+                "type": "AC180",
+                "use_encryption": False,
+                "persistent_connection": True,
+            }
+        )
+        self.lock = asyncio.Lock()
+        self.connection = ConnectionPool(
+            self.hass,
+            config.address,
+            config.persistent_connection,
+            transport=SimulatedTransport(self.device),
+        )
+        self.coordinator = PollingCoordinator(
+            self.hass, config, self.lock, self.connection
+        )
+
+    async def asyncTearDown(self):
+        await self.coordinator.async_shutdown()
+        await self.hass.async_stop(force=True)
+        self.config_dir.cleanup()
+
+    async def test_poll(self):
+        data = await self.coordinator._async_update_data()
+
+        self.assertEqual(data[FieldName.AC_OUTPUT_POWER.value], 230)
+        self.assertEqual(str(data[FieldName.AC_INPUT_FREQUENCY.value]), "50.1")
+        self.assertEqual(self.device.connects, 1)
+
+    async def test_write(self):
+        self.coordinator.data = await self.coordinator._async_update_data()
+        field = next(
+            f
+            for f in self.coordinator.bluetti_device.fields
+            if f.name == FieldName.CTRL_AC.value
+        )
+        queue = WriteQueue(
+            self.hass,
+            self.coordinator,
+            self.coordinator.bluetti_device,
+            self.connection,
+            self.lock,
+        )
+
+        # The simulator applies writes right away
+        with patch(
+            "custom_components.bluetti_bt.coordinator.WRITE_VERIFY_INITIAL_DELAY", 0.01
+        ):
+            self.assertTrue(await queue.async_write(field, True))
+        self.assertTrue(self.device.get_value(FieldName.CTRL_AC.value))
+        self.assertTrue(self.coordinator.data[FieldName.CTRL_AC.value])
+
+    async def test_poll_skips_fields_being_verified(self):
+        key = FieldName.CTRL_AC.value
+        self.coordinator.data = await self.coordinator._async_update_data()
+        field = next(f for f in self.coordinator.bluetti_device.fields if f.name == key)
+        self.device.set_value(key, True)
+
+        with patch(
+            "custom_components.bluetti_bt.coordinator.WRITE_VERIFY_INITIAL_DELAY", 0.1
+        ):
+            verify = asyncio.create_task(
+                self.coordinator.async_verify_writes([(field, True)])
+            )
+            await asyncio.sleep(0.01)
+
+            # The register isn't read, the last known value is kept
+            data = await self.coordinator._async_update_data()
+            self.assertFalse(data[key])
+
+            self.assertTrue(await verify)
+
+        self.assertTrue(self.coordinator.data[key])
+        self.assertIn(key, self.coordinator.scheduler.plan(0).keys)
+
+    async def test_reconnects_after_disconnect(self):
+        await self.coordinator._async_update_data()
+        self.device.disconnect()
+        data = await self.coordinator._async_update_data()
+
+        self.assertIsNotNone(data)
+        self.assertEqual(self.device.connects, 2)
+
+    async def test_link_stats(self):
+        await self.coordinator._async_update_data()
+
+        self.assertEqual(self.coordinator.link_stats.success_ratio, 1)
+        self.assertEqual(self.connection.connects, 1)
+        self.assertEqual(self.connection.bytes_received, self.device.bytes_sent)
+        self.assertEqual(self.connection.bytes_sent, self.device.bytes_received)
+
+    async def test_read_time_excludes_waiting_for_slot(self):
+        fleet = Fleet(self.hass, max_connections=1, spacing=0)
+        fleet.source = lambda address: "hci0"
+        self.connection.fleet = fleet
+
+        # Another device holds the only slot for a while
+        source = await fleet.async_acquire("00:11:22:33:44:99")
+        poll = asyncio.create_task(self.coordinator._async_update_data())
+        await asyncio.sleep(0.2)
+        fleet.release(source)
+
+        self.assertIsNotNone(await poll)
+        self.assertLess(self.coordinator.last_poll.read_time, 0.2)
+        self.assertLess(self.coordinator.link_stats.percentile(1), 0.2)
+
+    async def test_absent_device(self):
+        self.device.present = False
+
+        self.assertIsNone(await self.coordinator._async_update_data())
+        self.assertEqual(self.device.connects, 0)
+        self.assertEqual(self.coordinator.link_stats.success_ratio, 0)
+
+    async def test_absent_device_is_read_completely_when_back(self):
+        self.coordinator.data = await self.coordinator._async_update_data()
+        keys = set(self.coordinator.data)
+
+        self.device.present = False
+        self.coordinator.data = await self.coordinator._async_update_data()
+        self.device.present = True
+        self.coordinator.data = await self.coordinator._async_update_data()
+
+        self.assertEqual(set(self.coordinator.data), keys)
+        self.assertIn(FieldName.DEVICE_SN.value, keys)
+
+    async def test_keepalive_overlapping_poll(self):
+        timers = []
+
+        def call_later(hass, delay, action):
+            timer = {"pending": True}
+            timers.append(timer)
+
+            def cancel():
+                timer["pending"] = False
+
+            return cancel
+
+        with patch(
+            "custom_components.bluetti_bt.coordinator.async_call_later", call_later
+        ):
+            self.device.latency = 0.01
+            await self.coordinator._async_update_data()
+            self.assertEqual(len(timers), 1)
+
+            # The keepalive fires and a poll starts during its read
+            timers[0]["pending"] = False
+            keepalive = asyncio.create_task(self.coordinator._async_keepalive(None))
+            await asyncio.sleep(0.005)
+            await self.coordinator._async_update_data()
+            await keepalive
+
+            self.assertEqual(sum(timer["pending"] for timer in timers), 1)
+
+            self.coordinator._cancel_keepalive()
+            self.assertFalse(any(timer["pending"] for timer in timers))
+
+    async def test_absent_device_is_read_when_back(self):
+        self.device.present = False
+        for _ in range(self.coordinator.config.max_retries):
+            await self.coordinator._async_update_data()
+
+        self.assertEqual(self.coordinator.retry.state, RetryState.OPEN)
+        self.assertLessEqual(
+            self.coordinator.update_interval.total_seconds(),
+            self.coordinator.config.polling_interval,
+        )
+
+        self.device.present = True
+
+        self.assertIsNotNone(await self.coordinator._async_update_data())
+        self.assertEqual(self.coordinator.retry.state, RetryState.OK)
@@ -0,0 +1,86 @@
+import asyncio
+import tempfile
+import unittest
+from decimal import Decimal
+from unittest.mock import patch
+
+from bluetti_bt_lib.devices import AC300
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import HomeAssistant
+
+from custom_components.bluetti_bt.snapshot import Snapshot, async_remove_snapshot
+
+
+class TestSnapshot(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.config_dir = tempfile.TemporaryDirectory()
+        self.hass = HomeAssistant(self.config_dir.name)
+        self.device = AC300()
+        self.fields = {f.name: f for f in self.device.fields}
+
+    async def asyncTearDown(self):
+        await self.hass.async_stop(force=True)
+        self.config_dir.cleanup()
+
+    async def test_save_and_restore(self):
+        output_mode = self.fields["ac_output_mode"].e
+        data = {
+            "ac_input_voltage": Decimal("230.5"),
+            "ac_output_mode": list(output_mode)[0],
+            "version_arm": Decimal("5047.21"),
+            "total_battery_percent": 87,
+            "device_type": "AC300",
+            "pack_2_voltage": Decimal("52.3"),
+            "pack_2_cell_voltages": [Decimal("3.301"), Decimal("3.302")],
+        }
+
+        await self._async_save(data)
+        restored = await Snapshot(self.hass, "entry", self.device).async_load()
+
+        self.assertEqual(restored, data)
+        self.assertIsInstance(restored["ac_input_voltage"], Decimal)
+        self.assertIs(restored["ac_output_mode"], list(output_mode)[0])
+
+    async def test_drops_unknown_and_invalid_values(self):
+        await self._async_save(
+            {
+                "ac_input_voltage": "not a number",
+                "ac_output_mode": "NOT_A_MODE",
+                "unknown_field": 1,
+                "total_battery_percent": 87,
+            }
+        )
+
+        restored = await Snapshot(self.hass, "entry", self.device).async_load()
+
+        self.assertEqual(restored, {"total_battery_percent": 87})
+
+    async def test_remove(self):
+        await self._async_save({"total_battery_percent": 87})
+        await async_remove_snapshot(self.hass, "entry")
+
+        snapshot = Snapshot(self.hass, "entry", self.device)
+        self.assertIsNone(await snapshot.async_load())
+
+    async def test_unload_writes_pending_save(self):
+        snapshot = Snapshot(self.hass, "entry", self.device)
+        snapshot.async_schedule_save({"total_battery_percent": 87})
+        await snapshot.async_unload()
+
+        restored = await Snapshot(self.hass, "entry", self.device).async_load()
+        self.assertEqual(restored, {"total_battery_percent": 87})
+
+        # Nothing is written again after the snapshot was removed
+        snapshot.async_schedule_save({"total_battery_percent": 88})
+        await async_remove_snapshot(self.hass, "entry")
+        self.hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+        await self.hass.async_block_till_done()
+
+        self.assertIsNone(await Snapshot(self.hass, "entry", self.device).async_load())
+
+    async def _async_save(self, data: dict):
+        with patch("custom_components.bluetti_bt.snapshot.SNAPSHOT_SAVE_DELAY", 0):
+            Snapshot(self.hass, "entry", self.device).async_schedule_save(data)
+            # Let the delayed save run
+            await asyncio.sleep(0.01)
+            await self.hass.async_block_till_done()
@@ -0,0 +1,108 @@
+import asyncio
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from bluetti_bt_lib import FieldName
+from bluetti_bt_lib.devices import AC180
+from homeassistant.core import HomeAssistant
+
+from custom_components.bluetti_bt.connection import ConnectionPool
+from custom_components.bluetti_bt.coordinator import PollingCoordinator
+from custom_components.bluetti_bt.types import FullDeviceConfig
+from custom_components.bluetti_bt.write_queue import WriteQueue
+from simulator import SimulatedDevice, SimulatedTransport
+
+
+class TestWriteQueue(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.config_dir = tempfile.TemporaryDirectory()
+        self.hass = HomeAssistant(self.config_dir.name)
+
+        self.device = SimulatedDevice(AC180())
+        config = FullDeviceConfig.from_dict(
+            {
+                "address": self.device.address,
+                "name": "AC1801234567890123",
+                "type": "AC180",
+                "use_encryption": False,
+            }
+        )
+        lock = asyncio.Lock()
+        connection = ConnectionPool(
+            self.hass, config.address, transport=SimulatedTransport(self.device)
+        )
+        self.coordinator = PollingCoordinator(self.hass, config, lock, connection)
+        self.coordinator.data = await self.coordinator._async_update_data()
+        self.queue = WriteQueue(
+            self.hass,
+            self.coordinator,
+            self.coordinator.bluetti_device,
+            connection,
+            lock,
+        )
+
+        # The simulator applies writes right away
+        self.verify_delay = patch(
+            "custom_components.bluetti_bt.coordinator.WRITE_VERIFY_INITIAL_DELAY", 0.01
+        )
+        self.verify_delay.start()
+
+    async def asyncTearDown(self):
+        self.verify_delay.stop()
+        await self.coordinator.async_shutdown()
+        await self.hass.async_stop(force=True)
+        self.config_dir.cleanup()
+
+    def _field(self, name: FieldName):
+        return next(
+            f for f in self.coordinator.bluetti_device.fields if f.name == name.value
+        )
+
+    async def test_batches_writes(self):
+        connects = self.device.connects
+
+        results = await asyncio.gather(
+            self.queue.async_write(self._field(FieldName.CTRL_AC), True),
+            self.queue.async_write(self._field(FieldName.CTRL_DC), True),
+        )
+
+        self.assertEqual(results, [True, True])
+        self.assertEqual(self.device.connects, connects + 1)
+        self.assertEqual(self.device.writes, 2)
+        self.assertTrue(self.device.get_value(FieldName.CTRL_AC.value))
+        self.assertTrue(self.device.get_value(FieldName.CTRL_DC.value))
+
+    async def test_sends_last_value(self):
+        field = self._field(FieldName.CTRL_AC)
+
+        results = await asyncio.gather(
+            self.queue.async_write(field, True),
+            self.queue.async_write(field, False),
+        )
+
+        self.assertEqual(results, [True, True])
+        self.assertEqual(self.device.writes, 1)
+        self.assertFalse(self.device.get_value(FieldName.CTRL_AC.value))
+        self.assertFalse(self.coordinator.data[FieldName.CTRL_AC.value])
+
+    async def test_failed_send_resolves_waiters(self):
+        async def fail(pending):
+            raise RuntimeError("Send failed")
+
+        self.queue._async_send = fail
+
+        self.assertFalse(
+            await self.queue.async_write(self._field(FieldName.CTRL_AC), True)
+        )
+        self.assertFalse(self.queue._flush_lock.locked())
+
+    async def test_cancel(self):
+        write = asyncio.create_task(
+            self.queue.async_write(self._field(FieldName.CTRL_AC), True)
+        )
+        await asyncio.sleep(0)
+        self.queue.async_cancel()
+
+        self.assertFalse(await write)
+        self.assertEqual(self.device.writes, 0)